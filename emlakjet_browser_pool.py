@@ -0,0 +1,134 @@
+import asyncio
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+
+class EmlakjetBrowserPool:
+    def __init__(self, scraper, pages_per_context=50):
+        self.scraper = scraper
+        self.pages_per_context = pages_per_context
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.context_uses = 0
+        self.idle_pages = []
+        self.in_use = {}
+        self.retiring_contexts = set()
+        self.lock = asyncio.Lock()
+        self.stats = {
+            'browser_launches': 0,
+            'contexts_created': 0,
+            'pages_created': 0,
+            'pages_reused': 0
+        }
+    
+    async def start(self):
+        """Launch one long-lived browser and its first context"""
+        if self.browser:
+            return
+        
+        self.playwright = await async_playwright().start()
+        self.browser = await self.scraper.launch_browser(self.playwright)
+        self.stats['browser_launches'] += 1
+        await self.rotate_context()
+    
+    async def rotate_context(self):
+        """Replace the active context; the old one is closed once its pages are released"""
+        old_context = self.context
+        self.context = await self.scraper.new_stealth_context(self.browser)
+        self.context_uses = 0
+        self.stats['contexts_created'] += 1
+        self.in_use[self.context] = 0
+        
+        if old_context:
+            self.idle_pages = [p for p in self.idle_pages if p.context is not old_context]
+            self.retiring_contexts.add(old_context)
+            await self.close_retired_contexts()
+    
+    async def close_retired_contexts(self):
+        for context in list(self.retiring_contexts):
+            if self.in_use.get(context, 0) == 0:
+                self.retiring_contexts.discard(context)
+                self.in_use.pop(context, None)
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+    
+    async def acquire_page(self):
+        """Get a recycled page from the active context or open a new one"""
+        async with self.lock:
+            if self.browser and not self.browser.is_connected():
+                # Chromium crashed or was killed; its contexts and pages are gone with it
+                print("Tarayıcı bağlantısı koptu, yeniden başlatılıyor")
+                await self.close()
+            if not self.browser:
+                await self.start()
+            
+            if self.context_uses >= self.pages_per_context:
+                await self.rotate_context()
+            
+            if self.idle_pages:
+                page = self.idle_pages.pop()
+                self.stats['pages_reused'] += 1
+            else:
+                page = await self.context.new_page()
+                self.stats['pages_created'] += 1
+            
+            self.context_uses += 1
+            self.in_use[page.context] = self.in_use.get(page.context, 0) + 1
+            return page
+    
+    async def release_page(self, page):
+        """Blank the page outside the lock, then keep it for reuse unless its context is retiring"""
+        blanked = False
+        if page.context is self.context and not page.is_closed():
+            try:
+                await page.goto('about:blank')
+                blanked = True
+            except Exception:
+                pass
+        
+        async with self.lock:
+            context = page.context
+            self.in_use[context] = self.in_use.get(context, 1) - 1
+            
+            if blanked and context is self.context:
+                self.idle_pages.append(page)
+                return
+            
+            try:
+                await page.close()
+            except Exception:
+                pass
+            await self.close_retired_contexts()
+    
+    @asynccontextmanager
+    async def page(self):
+        page = await self.acquire_page()
+        try:
+            yield page
+        finally:
+            await self.release_page(page)
+    
+    async def close(self):
+        if self.context:
+            self.retiring_contexts.add(self.context)
+        for context in self.retiring_contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        if self.browser:
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+        if self.playwright:
+            await self.playwright.stop()
+        
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.idle_pages = []
+        self.in_use = {}
+        self.retiring_contexts = set()
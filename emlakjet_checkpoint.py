@@ -0,0 +1,34 @@
+import json
+import os
+
+class EmlakjetCheckpoint:
+    """Append-only journal of completed listings, keyed by ilanNo"""
+    
+    def __init__(self, journal_path='emlakjet_checkpoint.jsonl'):
+        self.journal_path = journal_path
+    
+    def load(self):
+        """Records completed by a previous, interrupted run; a torn last line is ignored"""
+        completed = {}
+        if not os.path.exists(self.journal_path):
+            return completed
+        
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get('ilanNo'):
+                    completed[record['ilanNo']] = record
+        return completed
+    
+    def record(self, details):
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(details, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def clear(self):
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
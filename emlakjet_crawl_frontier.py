@@ -0,0 +1,70 @@
+import asyncio
+from urllib.parse import parse_qsl, urldefrag, urlencode, urlsplit, urlunsplit
+
+class EmlakjetCrawlFrontier:
+    """Shared work queue for listing pages (firm/search, paginated) and detail pages"""
+    
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.seen_pages = set()
+        self.seen_listings = set()
+        self.listings = []
+        self.page_order = {}
+        self.listing_order = {}
+        self.pending_retries = 0
+        self.retry_released = asyncio.Event()
+    
+    def page_key(self, url):
+        """Drop the fragment and a sayfa=1/page=1 parameter, so page 1 is the same page with or without it"""
+        url = urldefrag(url)[0]
+        parts = urlsplit(url)
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        query = [(key, value) for key, value in params if not (key in ('sayfa', 'page') and value == '1')]
+        return urlunsplit(parts._replace(query=urlencode(query))) if len(query) < len(params) else url
+    
+    def add_page(self, url, order=()):
+        """`order` sorts the page's listings in the output, e.g. (start URL index, page number)"""
+        url = self.page_key(url)
+        if url in self.seen_pages:
+            return False
+        
+        self.seen_pages.add(url)
+        self.page_order[url] = order
+        self.queue.put_nowait(('page', url))
+        return True
+    
+    def add_listing(self, listing, order=()):
+        """Record a discovered listing once per ilanNo; returns False for duplicates"""
+        if listing['ilanNo'] in self.seen_listings:
+            return False
+        
+        self.seen_listings.add(listing['ilanNo'])
+        self.listings.append(listing)
+        self.listing_order[listing['ilanNo']] = order
+        return True
+    
+    def ordered_listings(self):
+        """Listings by page order and position on the page, independent of which worker finished first"""
+        return sorted(self.listings, key=lambda listing: self.listing_order[listing['ilanNo']])
+    
+    def add_detail(self, listing):
+        self.queue.put_nowait(('detail', listing))
+    
+    def add_retry(self, listing, delay):
+        """Requeue a failed detail after `delay` seconds without holding a worker"""
+        self.pending_retries += 1
+        asyncio.get_running_loop().call_later(delay, self.release_retry, listing)
+    
+    def release_retry(self, listing):
+        self.pending_retries -= 1
+        self.add_detail(listing)
+        self.retry_released.set()
+    
+    async def join(self):
+        """Wait until the queue is drained and no retry is still waiting out its backoff"""
+        while True:
+            await self.queue.join()
+            if not self.pending_retries:
+                return
+            self.retry_released.clear()
+            await self.retry_released.wait()
@@ -1,9 +1,84 @@
 import json
+import os
 import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from emlakjet_description_sanitizer import EmlakjetDescriptionSanitizer, EmlakjetDescriptionStore
+from emlakjet_feature_vocabulary import EmlakjetFeatureVocabulary
+from emlakjet_price_history import EmlakjetPriceHistory
+from emlakjet_storage import EmlakjetStorage
+
+NON_DIGIT_PATTERN = re.compile(r'[^\d]')
+FIRST_NUMBER_PATTERN = re.compile(r'(\d+)')
+PARENTHESES_PATTERN = re.compile(r'\s*\([^)]*\)')
+NON_ALNUM_PATTERN = re.compile(r'[^a-zA-Z0-9]+')
+
+# Turkish character mapping
+TURKISH_TRANSLATION = str.maketrans({
+    'ı': 'i', 'İ': 'I', 'ğ': 'g', 'Ğ': 'G',
+    'ü': 'u', 'Ü': 'U', 'ş': 's', 'Ş': 'S',
+    'ö': 'o', 'Ö': 'O', 'ç': 'c', 'Ç': 'C'
+})
 
 class EmlakjetDatabaseNormalizer:
-    def __init__(self):
+    # (output field, raw section, raw key, converter method); None section means the top-level record
+    FIELD_SPECS = [
+        ('ilanUrl', None, 'ilanUrl', None),
+        ('ilanNo', None, 'ilanNo', None),
+        ('m2Net', 'ilan_bilgileri', 'net_metrekare', 'extract_number'),
+        ('m2Brut', 'ilan_bilgileri', 'brut_metrekare', 'extract_number'),
+        ('odaSayisi', 'ilan_bilgileri', 'oda_sayisi', 'normalize_oda_sayisi'),
+        ('bulunduguKat', 'ilan_bilgileri', 'bulundugu_kat', 'normalize_bulundugu_kat'),
+        ('toplamKatSayisi', 'ilan_bilgileri', 'toplam_kat_sayisi', 'cast_int'),
+        ('binaYasi', 'ilan_bilgileri', 'bina_yasi', 'normalize_bina_yasi'),
+        ('ilanDurumu', 'ilan_bilgileri', 'kategorisi', 'normalize_ilan_durumu'),
+        ('isitmaSistemi', 'ilan_bilgileri', 'isitma_tipi', 'normalize_isitma_tipi'),
+        ('siteIcerisinde', 'ilan_bilgileri', 'site_icerisinde', 'normalize_boolean'),
+        ('fiyat', 'fiyat_bilgileri', 'fiyat', None),
+        ('ilanAciklamasiHtml', None, 'ilan_aciklamasi_html', None),
+        ('ozellikler', None, 'ilan_ozellikleri', 'normalize_ozellikler')
+    ]
+    
+    # Replaces the verbatim ilanAciklamasiHtml spec when descriptions are sanitized;
+    # a tuple of fields is filled from the tuple the converter returns
+    DESCRIPTION_SPEC = (('ilanAciklamasiHtml', 'ilanAciklamasi'), None, 'ilan_aciklamasi_html', 'sanitize_description')
+    DESCRIPTION_STORE_SPEC = ('ilanAciklamasiHash', None, 'ilan_aciklamasi_html', 'store_description')
+    # Replaces the ozellikler string lists when features are dictionary-encoded
+    FEATURE_BITSET_SPEC = ('ozellikBitset', None, 'ilan_ozellikleri', 'encode_ozellikler')
+    
+    def __init__(self, sanitize_descriptions=False, description_store_dir=None, feature_vocabulary_path=None):
         self.normalized_listings = []
+        self.worker_stats = {}
+        self.snake_case_cache = {}
+        self.options = {
+            'sanitize_descriptions': sanitize_descriptions,
+            'description_store_dir': description_store_dir,
+            'feature_vocabulary_path': feature_vocabulary_path
+        }
+        self.sanitizer = EmlakjetDescriptionSanitizer() if sanitize_descriptions else None
+        self.description_store = EmlakjetDescriptionStore(description_store_dir) if description_store_dir else None
+        self.feature_vocabulary = EmlakjetFeatureVocabulary(feature_vocabulary_path) if feature_vocabulary_path else None
+        self.field_converters = [
+            (field, section, key, getattr(self, converter) if converter else None)
+            for field, section, key, converter in self.field_specs()
+        ]
+    
+    def field_specs(self):
+        specs = []
+        for spec in self.FIELD_SPECS:
+            if spec[0] == 'ilanAciklamasiHtml' and (self.sanitizer or self.description_store):
+                # With the store on, the verbatim HTML is only reachable through ilanAciklamasiHash
+                if self.sanitizer:
+                    specs.append(self.DESCRIPTION_SPEC)
+                if self.description_store:
+                    specs.append(self.DESCRIPTION_STORE_SPEC)
+            elif spec[0] == 'ozellikler' and self.feature_vocabulary:
+                specs.append(self.FEATURE_BITSET_SPEC)
+            else:
+                specs.append(spec)
+        return specs
     
     def normalize_listings(self, raw_file_path):
         """Normalize raw Emlakjet listings to database schema"""
@@ -20,31 +95,209 @@ class EmlakjetDatabaseNormalizer:
             print(f"Normalization error: {e}")
             return []
     
-    def normalize_single_listing(self, raw_listing):
-        """Normalize single listing to database schema"""
-        # Get raw data
-        ilan_bilgileri = raw_listing.get('ilan_bilgileri', {})
-        fiyat_bilgileri = raw_listing.get('fiyat_bilgileri', {})
-        ozellikler = raw_listing.get('ilan_ozellikleri', {})
+    def iter_raw_listings(self, raw_file_path):
+        """Yield raw listings one at a time from a JSON array or NDJSON file"""
+        with open(raw_file_path, 'r', encoding='utf-8') as f:
+            first = f.read(1)
+            while first and first.isspace():
+                first = f.read(1)
+            
+            if first != '[':
+                if first:
+                    yield json.loads(first + f.readline())
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+                return
+            
+            # Incrementally decode array elements without loading the whole file
+            decoder = json.JSONDecoder()
+            separator = re.compile(r'[\s,]*')
+            buffer = ''
+            pos = 0
+            while True:
+                pos = separator.match(buffer, pos).end()
+                if buffer.startswith(']', pos):
+                    return
+                try:
+                    listing, pos = decoder.raw_decode(buffer, pos)
+                except ValueError:
+                    chunk = f.read(1024 * 1024)
+                    if not chunk:
+                        # The closing bracket returns above; reaching EOF means a bad element or a cut-off file
+                        raise ValueError(f"{raw_file_path}: malformed or truncated JSON array near {buffer[pos:pos + 80]!r}")
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+                yield listing
+    
+    def iter_normalized(self, raw_file_path):
+        """Generator that normalizes one raw listing at a time"""
+        for listing in self.iter_raw_listings(raw_file_path):
+            yield self.normalize_single_listing(listing)
+    
+    def normalize_to_ndjson(self, raw_file_path, output_file):
+        """Stream raw listings to normalized NDJSON with constant memory"""
+        count = 0
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for normalized in self.iter_normalized(raw_file_path):
+                f.write(json.dumps(normalized, ensure_ascii=False) + '\n')
+                count += 1
+        self.save_vocabulary()
+        
+        print(f"Database normalized listings streamed to: {output_file}")
+        print(f"Total listings: {count}")
+        return count
+    
+    def raw_format(self, raw_file_path):
+        """'json' for a JSON array file, 'ndjson' otherwise"""
+        with open(raw_file_path, 'r', encoding='utf-8') as f:
+            first = f.read(1)
+            while first and first.isspace():
+                first = f.read(1)
+        return 'json' if first == '[' else 'ndjson'
+    
+    def iter_raw_lines(self, raw_file_path):
+        """Yield undecoded NDJSON lines so workers do the JSON parsing"""
+        with open(raw_file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield line
+    
+    def iter_raw_chunks(self, raw_file_path, chunk_size=1000):
+        """Yield lists of chunk_size raw listings (NDJSON lines or decoded array elements)"""
+        if self.raw_format(raw_file_path) == 'json':
+            listings = self.iter_raw_listings(raw_file_path)
+        else:
+            listings = self.iter_raw_lines(raw_file_path)
+        
+        chunk = []
+        for listing in listings:
+            chunk.append(listing)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def iter_chunk_results(self, chunks, processes, ndjson):
+        """Normalize chunks across a process pool, yielding results in input order"""
+        if processes <= 1:
+            for chunk in chunks:
+                yield normalize_chunk(chunk, ndjson, self.options)
+            return
+        
+        # Keep a bounded window of chunks in flight so memory stays flat on large dumps
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(normalize_chunk, chunk, ndjson, self.options))
+                if len(pending) >= processes * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def record_worker_stats(self, stats):
+        worker = self.worker_stats.setdefault(stats['pid'], {'chunks': 0, 'records': 0, 'seconds': 0.0})
+        worker['chunks'] += 1
+        worker['records'] += stats['records']
+        worker['seconds'] += stats['seconds']
+        worker['records_per_sec'] = round(worker['records'] / worker['seconds']) if worker['seconds'] else 0
+    
+    def normalize_parallel(self, raw_file_path, output_file, processes=None, chunk_size=1000, ndjson=True):
+        """Shard the raw dump across worker processes and merge the output in order.
+        
+        Output is byte-identical to normalize_to_ndjson (ndjson=True) or to
+        normalize_listings + save_normalized (ndjson=False).
+        """
+        if self.feature_vocabulary:
+            raise ValueError('Feature encoding needs one shared vocabulary; use the serial normalizers')
+        
+        processes = processes or os.cpu_count() or 1
+        chunks = self.iter_raw_chunks(raw_file_path, chunk_size)
+        results = self.iter_chunk_results(chunks, processes, ndjson)
+        self.worker_stats = {}
+        
+        if not ndjson:
+            for normalized_listings, stats in results:
+                self.record_worker_stats(stats)
+                self.normalized_listings.extend(normalized_listings)
+            self.save_normalized(output_file)
+            return len(self.normalized_listings)
+        
+        count = 0
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for payload, stats in results:
+                self.record_worker_stats(stats)
+                f.write(payload)
+                count += stats['records']
+        
+        print(f"Database normalized listings streamed to: {output_file}")
+        print(f"Total listings: {count}")
+        return count
+    
+    def normalize_to_storage(self, raw_file_path, storage, batch_size=1000):
+        """Stream normalized listings into an EmlakjetStorage with batched upserts"""
+        count = storage.upsert_many(self.iter_normalized(raw_file_path), batch_size=batch_size)
+        self.save_vocabulary()
         
-        normalized = {
-            'ilanUrl': raw_listing.get('ilanUrl'),
-            'ilanNo': raw_listing.get('ilanNo'),
+        print(f"Database normalized listings upserted to: {storage.db_path}")
+        print(f"Total listings: {count}")
+        return count
+    
+    def tracked_values(self, raw_listing):
+        """Fields whose changes are kept by EmlakjetPriceHistory"""
+        ilan_bilgileri = raw_listing.get('ilan_bilgileri', {})
+        return {
+            'fiyat': raw_listing.get('fiyat_bilgileri', {}).get('fiyat'),
             'm2Net': self.extract_number(ilan_bilgileri.get('net_metrekare')),
-            'm2Brut': self.extract_number(ilan_bilgileri.get('brut_metrekare')),
-            'odaSayisi': self.normalize_oda_sayisi(ilan_bilgileri.get('oda_sayisi')),
-            'bulunduguKat': self.normalize_bulundugu_kat(ilan_bilgileri.get('bulundugu_kat')),
-            'toplamKatSayisi': self.cast_int(ilan_bilgileri.get('toplam_kat_sayisi')),
-            'binaYasi': self.normalize_bina_yasi(ilan_bilgileri.get('bina_yasi')),
-            'ilanDurumu': self.normalize_ilan_durumu(ilan_bilgileri.get('kategorisi')),
-            'isitmaSistemi': self.normalize_isitma_tipi(ilan_bilgileri.get('isitma_tipi')),
-            'siteIcerisinde': self.normalize_boolean(ilan_bilgileri.get('site_icerisinde')),
-            'fiyat': fiyat_bilgileri.get('fiyat'),
-            'ilanAciklamasiHtml': raw_listing.get('ilan_aciklamasi_html'),
-            'ozellikler': self.normalize_ozellikler(ozellikler)
+            'kullanim_durumu': ilan_bilgileri.get('kullanim_durumu'),
+            'fiyat_durumu': ilan_bilgileri.get('fiyat_durumu')
         }
+    
+    def record_history(self, raw_file_path, history):
+        """Record price/field changes for every raw listing; returns the number of new events"""
+        events = history.record_many(
+            (listing.get('ilanNo'), self.tracked_values(listing))
+            for listing in self.iter_raw_listings(raw_file_path)
+        )
+        print(f"History events recorded: {events}")
+        return events
+    
+    def normalize_single_listing(self, raw_listing):
+        """Normalize single listing to database schema"""
+        return self.normalize_batch([raw_listing])[0]
+    
+    def normalize_batch(self, raw_listings, columnar=False):
+        """Normalize a list of raw listings using the FIELD_SPECS table.
+        
+        With columnar=True the result is a dict of field -> list of values.
+        """
+        converters = self.field_converters
+        normalized_listings = []
+        append = normalized_listings.append
         
-        return normalized
+        for raw_listing in raw_listings:
+            sections = {
+                None: raw_listing,
+                'ilan_bilgileri': raw_listing.get('ilan_bilgileri', {}),
+                'fiyat_bilgileri': raw_listing.get('fiyat_bilgileri', {})
+            }
+            normalized = {}
+            for field, section, key, converter in converters:
+                value = sections[section].get(key)
+                if converter is None:
+                    normalized[field] = value
+                elif field.__class__ is tuple:
+                    normalized.update(zip(field, converter(value)))
+                else:
+                    normalized[field] = converter(value)
+            append(normalized)
+        
+        if columnar:
+            fields = [name for field, _, _, _ in converters for name in (field if field.__class__ is tuple else (field,))]
+            return {field: [n[field] for n in normalized_listings] for field in fields}
+        return normalized_listings
     
     def extract_number(self, text):
         """Extract only number from text"""
@@ -52,7 +305,7 @@ class EmlakjetDatabaseNormalizer:
             return None
         
         # Remove "m²", spaces, text, keep only numbers
-        cleaned = re.sub(r'[^\d]', '', str(text))
+        cleaned = NON_DIGIT_PATTERN.sub('', str(text))
         return int(cleaned) if cleaned else None
     
     def normalize_oda_sayisi(self, text):
@@ -68,7 +321,7 @@ class EmlakjetDatabaseNormalizer:
             return None
         
         # Extract just the floor number from "4.Kat", "9.Kat"
-        match = re.search(r'(\d+)', str(text))
+        match = FIRST_NUMBER_PATTERN.search(str(text))
         return int(match.group(1)) if match else None
     
     def cast_int(self, value):
@@ -87,7 +340,7 @@ class EmlakjetDatabaseNormalizer:
             return None
         
         # "0 (Yeni)" → 0, "11-15" → 11
-        match = re.search(r'(\d+)', str(text))
+        match = FIRST_NUMBER_PATTERN.search(str(text))
         return int(match.group(1)) if match else None
     
     def normalize_ilan_durumu(self, text):
@@ -103,7 +356,7 @@ class EmlakjetDatabaseNormalizer:
             return None
         
         # Remove parentheses content
-        cleaned = re.sub(r'\s*\([^)]*\)', '', str(text))
+        cleaned = PARENTHESES_PATTERN.sub('', str(text))
         return cleaned.strip()
     
     def normalize_boolean(self, text):
@@ -155,36 +408,121 @@ class EmlakjetDatabaseNormalizer:
         
         return result if result else None
     
+    def encode_ozellikler(self, ozellikler):
+        """Normalized ozellikler as a hex bitset over the feature vocabulary"""
+        return self.feature_vocabulary.to_hex(self.feature_vocabulary.encode(self.normalize_ozellikler(ozellikler)))
+    
+    def save_vocabulary(self):
+        if self.feature_vocabulary:
+            self.feature_vocabulary.save()
+    
+    def sanitize_description(self, html):
+        """(sanitized html, plain text) from a single sanitizer pass"""
+        sanitized = self.sanitizer.sanitize(html)
+        return sanitized['html'], sanitized['text']
+    
+    def store_description(self, html):
+        """Keep the raw description once per content hash; the record only carries the hash"""
+        return self.description_store.put(html)
+    
+    def description_report(self, raw_file_path):
+        """Per-record and total byte sizes of raw vs sanitized descriptions"""
+        sanitizer = self.sanitizer or EmlakjetDescriptionSanitizer()
+        records = []
+        totals = {'raw_bytes': 0, 'html_bytes': 0, 'text_bytes': 0}
+        
+        for listing in self.iter_raw_listings(raw_file_path):
+            raw_html = listing.get('ilan_aciklamasi_html') or ''
+            sanitized = sanitizer.sanitize(raw_html)
+            sizes = {
+                'raw_bytes': len(raw_html.encode('utf-8')),
+                'html_bytes': len(sanitized['html'].encode('utf-8')),
+                'text_bytes': len(sanitized['text'].encode('utf-8'))
+            }
+            for key, size in sizes.items():
+                totals[key] += size
+            sizes['ilanNo'] = listing.get('ilanNo')
+            sizes['reduction_pct'] = round((1 - sizes['html_bytes'] / sizes['raw_bytes']) * 100, 1) if sizes['raw_bytes'] else 0.0
+            records.append(sizes)
+        
+        totals['reduction_pct'] = round((1 - totals['html_bytes'] / totals['raw_bytes']) * 100, 1) if totals['raw_bytes'] else 0.0
+        return {'records': records, 'total': totals}
+    
     def to_snake_case(self, text):
-        """Convert text to snake_case"""
+        """Convert text to snake_case (memoized per category name)"""
         if not text:
             return None
         
-        # Turkish character mapping
-        tr_map = {
-            'ı': 'i', 'İ': 'I', 'ğ': 'g', 'Ğ': 'G',
-            'ü': 'u', 'Ü': 'U', 'ş': 's', 'Ş': 'S',
-            'ö': 'o', 'Ö': 'O', 'ç': 'c', 'Ç': 'C'
-        }
-        
-        # Replace Turkish characters
-        for tr_char, en_char in tr_map.items():
-            text = text.replace(tr_char, en_char)
-        
-        # Convert to snake_case
-        snake = re.sub(r'[^a-zA-Z0-9]+', '_', str(text))
-        return snake.lower().strip('_')
+        snake = self.snake_case_cache.get(text)
+        if snake is None:
+            snake = NON_ALNUM_PATTERN.sub('_', str(text).translate(TURKISH_TRANSLATION)).lower().strip('_')
+            self.snake_case_cache[text] = snake
+        return snake
     
     def save_normalized(self, output_file):
         """Save normalized listings"""
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(self.normalized_listings, f, ensure_ascii=False, indent=2)
+        self.save_vocabulary()
         
         print(f"Database normalized listings saved to: {output_file}")
         print(f"Total listings: {len(self.normalized_listings)}")
 
+def normalize_chunk(chunk, ndjson=True, options=None):
+    """Worker entry point: normalize one chunk, returning (NDJSON text or records, stats)"""
+    started = time.perf_counter()
+    normalizer = EmlakjetDatabaseNormalizer(**(options or {}))
+    raw_listings = [json.loads(raw) if isinstance(raw, str) else raw for raw in chunk]
+    normalized_listings = normalizer.normalize_batch(raw_listings)
+    
+    if ndjson:
+        payload = ''.join(json.dumps(normalized, ensure_ascii=False) + '\n' for normalized in normalized_listings)
+    else:
+        payload = normalized_listings
+    
+    return payload, {
+        'pid': os.getpid(),
+        'records': len(normalized_listings),
+        'seconds': time.perf_counter() - started
+    }
+
 def main():
-    normalizer = EmlakjetDatabaseNormalizer()
+    sanitize = 'sanitize' in sys.argv[1:]
+    normalizer = EmlakjetDatabaseNormalizer(
+        sanitize_descriptions=sanitize,
+        description_store_dir='descriptions' if sanitize else None,
+        feature_vocabulary_path='emlakjet_feature_vocabulary.json' if 'features' in sys.argv[1:] else None
+    )
+    
+    if sanitize:
+        print(json.dumps(normalizer.description_report('emlakjet_listings_raw.json'), ensure_ascii=False, indent=2))
+    
+    if 'parallel' in sys.argv[1:]:
+        if 'ndjson' in sys.argv[1:]:
+            normalizer.normalize_parallel('emlakjet_listings_raw.jsonl', 'emlakjet_listings_database.jsonl')
+        else:
+            normalizer.normalize_parallel('emlakjet_listings_raw.json', 'emlakjet_listings_database.json', ndjson=False)
+        print(json.dumps(normalizer.worker_stats, indent=2))
+        return
+    
+    if 'ndjson' in sys.argv[1:]:
+        normalizer.normalize_to_ndjson('emlakjet_listings_raw.jsonl', 'emlakjet_listings_database.jsonl')
+        return
+    
+    if 'sqlite' in sys.argv[1:]:
+        storage = EmlakjetStorage('emlakjet_listings.db')
+        normalizer.normalize_to_storage('emlakjet_listings_raw.json', storage)
+        if 'parquet' in sys.argv[1:]:
+            storage.export_parquet('emlakjet_listings.parquet')
+        storage.close()
+        return
+    
+    if 'history' in sys.argv[1:]:
+        history = EmlakjetPriceHistory('emlakjet_listings.db')
+        normalizer.record_history('emlakjet_listings_raw.json', history)
+        print(json.dumps(history.price_drops(), ensure_ascii=False, indent=2))
+        history.close()
+        return
     
     # Normalize raw listings to database schema
     normalized_listings = normalizer.normalize_listings('emlakjet_listings_raw.json')
@@ -0,0 +1,155 @@
+import gzip
+import hashlib
+import os
+import re
+from html import escape
+from html.parser import HTMLParser
+
+ALLOWED_TAGS = {'p', 'br', 'ul', 'ol', 'li', 'strong', 'b', 'em', 'i', 'u'}
+TEXT_BREAK_TAGS = {'p', 'br', 'ul', 'ol', 'li', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr'}
+SKIPPED_TAGS = {'script', 'style'}
+# Site widget injected into descriptions: "JetHat ile ekstra ücret ödemeden arayın Telefona Bak"
+WIDGET_PATTERN = re.compile(r'JetHat\b.*\bTelefona Bak', re.S)
+
+WHITESPACE_PATTERN = re.compile(r'[\s\xa0]+')
+EMPTY_INLINE_PATTERN = re.compile(r'<(strong|b|em|i|u)>\s*</\1>')
+EMPTY_BLOCK_PATTERN = re.compile(r'<(p|li|ul|ol)>(?:\s|<br>)*</\1>')
+BLANK_LINES_PATTERN = re.compile(r'\n\s*\n\s*')
+
+class DescriptionBuilder(HTMLParser):
+    """Collects tag-only HTML (no attributes, no wrappers) and line-broken plain text"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html_parts = []
+        self.text_parts = []
+        self.skip_tag = None
+        self.skip_depth = 0
+        self.div_starts = []
+    
+    def handle_starttag(self, tag, attrs):
+        if self.skip_depth:
+            if tag == self.skip_tag:
+                self.skip_depth += 1
+            return
+        if tag in SKIPPED_TAGS:
+            self.skip_tag = tag
+            self.skip_depth = 1
+            return
+        if tag == 'div':
+            self.div_starts.append((len(self.html_parts), len(self.text_parts)))
+        if tag in ALLOWED_TAGS:
+            self.html_parts.append(f'<{tag}>')
+        if tag in TEXT_BREAK_TAGS:
+            self.text_parts.append('\n')
+    
+    def handle_startendtag(self, tag, attrs):
+        if self.skip_depth:
+            return
+        if tag in ALLOWED_TAGS:
+            self.html_parts.append(f'<{tag}>')
+        if tag in TEXT_BREAK_TAGS:
+            self.text_parts.append('\n')
+    
+    def handle_endtag(self, tag):
+        if self.skip_depth:
+            if tag == self.skip_tag:
+                self.skip_depth -= 1
+            return
+        if tag == 'div' and self.div_starts:
+            # A div holding nothing but the widget is dropped once its content is known
+            html_start, text_start = self.div_starts.pop()
+            if WIDGET_PATTERN.fullmatch(''.join(self.text_parts[text_start:]).strip()):
+                del self.html_parts[html_start:]
+                del self.text_parts[text_start:]
+                return
+        if tag in ALLOWED_TAGS and tag != 'br':
+            self.html_parts.append(f'</{tag}>')
+        if tag in TEXT_BREAK_TAGS:
+            self.text_parts.append('\n')
+    
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        data = WHITESPACE_PATTERN.sub(' ', data)
+        self.html_parts.append(escape(data, quote=False))
+        self.text_parts.append(data)
+
+class EmlakjetDescriptionSanitizer:
+    """Minimal HTML and plain text for ilan_aciklamasi_html"""
+    
+    def sanitize(self, html):
+        """Return {'html': sanitized, 'text': plain}"""
+        if html is None:
+            return {'html': None, 'text': None}
+        
+        builder = DescriptionBuilder()
+        builder.feed(html)
+        builder.close()
+        
+        sanitized = ''.join(builder.html_parts)
+        previous = None
+        while previous != sanitized:
+            previous = sanitized
+            sanitized = EMPTY_INLINE_PATTERN.sub('', sanitized)
+            sanitized = EMPTY_BLOCK_PATTERN.sub('', sanitized)
+        
+        lines = (line.strip() for line in ''.join(builder.text_parts).split('\n'))
+        text = BLANK_LINES_PATTERN.sub('\n', '\n'.join(line for line in lines if line))
+        
+        return {'html': sanitized.strip(), 'text': text}
+
+class EmlakjetDescriptionStore:
+    """Raw description HTML stored once per content hash, gzip-compressed"""
+    
+    def __init__(self, store_dir='descriptions'):
+        self.store_dir = store_dir
+        self.stats = {
+            'stored': 0,
+            'deduplicated': 0,
+            'raw_bytes': 0,
+            'stored_bytes': 0
+        }
+        os.makedirs(self.store_dir, exist_ok=True)
+    
+    def entry_path(self, digest):
+        return os.path.join(self.store_dir, f'{digest}.html.gz')
+    
+    def put(self, html):
+        """Store html unless an identical description is already there; returns its hash"""
+        if html is None:
+            return None
+        
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.entry_path(digest)
+        self.stats['raw_bytes'] += len(data)
+        
+        if os.path.exists(path):
+            self.stats['deduplicated'] += 1
+            return digest
+        
+        compressed = gzip.compress(data, mtime=0)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(compressed)
+        os.replace(temp_path, path)
+        self.stats['stored'] += 1
+        self.stats['stored_bytes'] += len(compressed)
+        return digest
+    
+    def get(self, digest):
+        try:
+            with open(self.entry_path(digest), 'rb') as f:
+                return gzip.decompress(f.read()).decode('utf-8')
+        except OSError:
+            return None
+    
+    def summary(self):
+        return {
+            'stored': self.stats['stored'],
+            'deduplicated': self.stats['deduplicated'],
+            'raw_bytes': self.stats['raw_bytes'],
+            'stored_bytes': self.stats['stored_bytes'],
+            'ratio': round(self.stats['stored_bytes'] / self.stats['raw_bytes'], 3) if self.stats['raw_bytes'] else 0.0
+        }
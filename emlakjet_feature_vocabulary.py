@@ -0,0 +1,100 @@
+import json
+import os
+
+class EmlakjetFeatureVocabulary:
+    """Stable integer IDs for (group, category, feature) and per-listing feature bitsets"""
+    
+    def __init__(self, vocabulary_path='emlakjet_feature_vocabulary.json'):
+        self.vocabulary_path = vocabulary_path
+        self.features = []
+        self.ids = {}
+        self.name_masks = {}
+        self.load()
+    
+    def load(self):
+        if not self.vocabulary_path or not os.path.exists(self.vocabulary_path):
+            return
+        
+        with open(self.vocabulary_path, 'r', encoding='utf-8') as f:
+            for group, category, feature in json.load(f)['features']:
+                self.feature_id(group, category, feature)
+    
+    def save(self):
+        """IDs are append-only, so bitsets written by earlier runs stay valid"""
+        with open(self.vocabulary_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'features': self.features}, f, ensure_ascii=False)
+        os.replace(self.vocabulary_path + '.tmp', self.vocabulary_path)
+    
+    def feature_id(self, group, category, feature):
+        key = (group, category, feature)
+        feature_id = self.ids.get(key)
+        if feature_id is None:
+            feature_id = len(self.features)
+            self.ids[key] = feature_id
+            self.features.append([group, category, feature])
+            self.name_masks[feature] = self.name_masks.get(feature, 0) | (1 << feature_id)
+        return feature_id
+    
+    def encode(self, ozellikler):
+        """Normalized ozellikler ({group: {category: [feature]}}) -> bitset int"""
+        bitset = 0
+        for group, categories in (ozellikler or {}).items():
+            for category, features in (categories or {}).items():
+                for feature in features:
+                    bitset |= 1 << self.feature_id(group, category, feature)
+        return bitset
+    
+    def decode(self, bitset):
+        """Bitset int -> ozellikler dict, features in vocabulary order"""
+        ozellikler = {}
+        feature_id = 0
+        while bitset:
+            if bitset & 1:
+                group, category, feature = self.features[feature_id]
+                ozellikler.setdefault(group, {}).setdefault(category, []).append(feature)
+            bitset >>= 1
+            feature_id += 1
+        return ozellikler
+    
+    def to_hex(self, bitset):
+        return format(bitset, 'x')
+    
+    def from_hex(self, value):
+        return int(value, 16) if value else 0
+    
+    def masks(self, features):
+        """One mask per requested feature name (any category); None if a feature was never seen"""
+        masks = []
+        for feature in features:
+            mask = self.name_masks.get(feature)
+            if not mask:
+                return None
+            masks.append(mask)
+        return masks
+    
+    def has_all(self, bitsets, features):
+        """Keys of {key: bitset} whose listing has every feature in `features`"""
+        masks = self.masks(features)
+        if masks is None:
+            return []
+        
+        # Names that map to a single ID collapse into one AND mask; the rest need any-of checks
+        required = 0
+        any_of = []
+        for mask in masks:
+            if mask & (mask - 1):
+                any_of.append(mask)
+            else:
+                required |= mask
+        
+        if not any_of:
+            return [key for key, bitset in bitsets.items() if bitset & required == required]
+        return [
+            key for key, bitset in bitsets.items()
+            if bitset & required == required and all(bitset & mask for mask in any_of)
+        ]
+    
+    def filter_listings(self, listings, features):
+        """Normalized listings carrying ozellikBitset that have every feature in `features`"""
+        bitsets = {i: self.from_hex(listing.get('ozellikBitset')) for i, listing in enumerate(listings)}
+        return [listings[i] for i in self.has_all(bitsets, features)]
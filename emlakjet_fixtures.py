@@ -0,0 +1,188 @@
+import json
+import os
+from html import escape
+from emlakjet_listing_fields import EmlakjetListingFields
+
+class EmlakjetFixtureRenderer:
+    """Render raw listing records back into synthetic pages with the markup the scraper expects.
+    
+    The markup (hashed class names included) is modeled on what the scraper's selectors look
+    for, not copied from saved live pages, so parsing these back only shows self-consistency.
+    """
+    
+    TABS = [
+        ('ic_ozellikler', 'İç Özellikler'),
+        ('dis_ozellikler', 'Dış Özellikler'),
+        ('konum_ozellikleri', 'Konum Özellikleri')
+    ]
+    
+    # Client-side tab switching like the site's headlessui tabs; the new panel shows up after data-delay ms
+    TAB_SCRIPT = """(() => {
+        const delay = Number(document.currentScript.dataset.delay);
+        const tabs = Array.from(document.querySelectorAll('[role="tab"]'));
+        const panels = Array.from(document.querySelectorAll('[role="tabpanel"]'));
+        const select = (index) => {
+            tabs.forEach((tab, i) => tab.setAttribute('data-headlessui-state', i === index ? 'selected' : ''));
+            panels.forEach((panel, i) => {
+                panel.setAttribute('data-headlessui-state', i === index ? 'selected' : '');
+                panel.hidden = i !== index;
+            });
+        };
+        tabs.forEach((tab, index) => tab.addEventListener('click', () => setTimeout(() => select(index), delay)));
+        select(0);
+    })();"""
+    
+    def __init__(self):
+        self.field_labels = {field: label for label, field in EmlakjetListingFields.FIELD_MAPPING.items()}
+    
+    def text(self, value):
+        return escape(str(value), quote=False).replace('\xa0', '&nbsp;')
+    
+    def render_price(self, fiyat_bilgileri):
+        price_text = fiyat_bilgileri.get('fiyat_text')
+        if not price_text:
+            return ''
+        
+        lines = ''.join(f'<div>{self.text(line)}</div>' for line in price_text.split('\n'))
+        return f'<div class="styles_price__8Z5pM">{lines}</div>'
+    
+    def render_ilan_bilgileri(self, bilgiler):
+        items = ''.join(
+            f'<li><span class="styles_key__wX_g4">{self.text(self.field_labels[field])}</span>'
+            f'<span class="styles_value__xmNV3">{self.text(value)}</span></li>'
+            for field, value in bilgiler.items()
+            if field in self.field_labels
+        )
+        return f'<section><h2>İlan Bilgileri</h2><ul class="styles_list__Kp3aQ">{items}</ul></section>'
+    
+    def render_aciklama(self, aciklama_html):
+        if aciklama_html is None:
+            return ''
+        return (
+            '<section><h2>İlan Açıklaması</h2><div class="styles_description__Yt7cE">'
+            f'<div class="styles_innerContainer__b2LmW">{aciklama_html}</div></div></section>'
+        )
+    
+    def render_tab_panel(self, categories, selected):
+        state = 'selected' if selected else ''
+        content = ''.join(
+            f'<div class="styles_tabContentTitle__3Q2jN">{self.text(category)}</div>'
+            f'<ul class="styles_tabContentList__Vd8sR">{"".join(f"<li>{self.text(f)}</li>" for f in features)}</ul>'
+            for category, features in categories.items()
+        )
+        return f'<div role="tabpanel" data-headlessui-state="{state}">{content}</div>'
+    
+    def render_ozellikler(self, ozellikler, all_tabs=True):
+        """Render the feature tabs; with all_tabs=False only the selected panel is mounted"""
+        buttons = ''.join(
+            f'<button role="tab" data-headlessui-state="{"selected" if i == 0 else ""}">{label}</button>'
+            for i, (_, label) in enumerate(self.TABS)
+        )
+        panels = ''.join(
+            self.render_tab_panel(ozellikler.get(key) or {}, i == 0)
+            for i, (key, _) in enumerate(self.TABS)
+            if all_tabs or i == 0
+        )
+        return f'<section><h2>İlan Özellikleri</h2><div role="tablist">{buttons}</div>{panels}</section>'
+    
+    def render_next_data(self, record):
+        """A __NEXT_DATA__-style payload carrying the same record (layout assumed, see EmlakjetNextDataExtractor)"""
+        fiyat_bilgileri = record.get('fiyat_bilgileri', {})
+        ozellikler = record.get('ilan_ozellikleri', {})
+        return {
+            'props': {
+                'pageProps': {
+                    'listing': {
+                        'id': record.get('ilanNo'),
+                        'info': [
+                            {'key': self.field_labels[field], 'value': value}
+                            for field, value in record.get('ilan_bilgileri', {}).items()
+                            if field in self.field_labels
+                        ],
+                        'price': {
+                            'text': fiyat_bilgileri.get('fiyat_text'),
+                            'value': fiyat_bilgileri.get('fiyat'),
+                            'currency': fiyat_bilgileri.get('para_birimi')
+                        },
+                        'description': record.get('ilan_aciklamasi_html'),
+                        'properties': [
+                            {
+                                'name': label,
+                                'categories': [
+                                    {'name': category, 'items': features}
+                                    for category, features in (ozellikler.get(key) or {}).items()
+                                ]
+                            }
+                            for key, label in self.TABS
+                        ]
+                    }
+                }
+            },
+            'page': '/ilan/[slug]'
+        }
+    
+    def render_next_data_script(self, payload):
+        data = json.dumps(payload, ensure_ascii=False).replace('</', '<\\/')
+        return f'<script id="__NEXT_DATA__" type="application/json">{data}</script>'
+    
+    def render_tab_script(self, delay_ms=0):
+        return f'<script data-delay="{int(delay_ms)}">{self.TAB_SCRIPT}</script>'
+    
+    def render_listing_page(self, record, all_tabs=True, next_data=False, tab_delay_ms=None):
+        """With tab_delay_ms set, the tabs switch on click like on the live site"""
+        title = record.get('ilan_bilgileri', {}).get('tipi') or 'İlan'
+        script = self.render_next_data_script(self.render_next_data(record)) if next_data else ''
+        if tab_delay_ms is not None:
+            script += self.render_tab_script(tab_delay_ms)
+        return (
+            '<!DOCTYPE html><html lang="tr"><head><meta charset="utf-8">'
+            f'<title>{self.text(title)} | Emlakjet</title></head><body>'
+            f'<main>{self.render_price(record.get("fiyat_bilgileri", {}))}'
+            '<div id="ilan-hakkinda">'
+            f'{self.render_ilan_bilgileri(record.get("ilan_bilgileri", {}))}'
+            f'{self.render_aciklama(record.get("ilan_aciklamasi_html"))}'
+            f'{self.render_ozellikler(record.get("ilan_ozellikleri", {}), all_tabs)}'
+            f'</div></main>{script}</body></html>'
+        )
+    
+    def render_firm_page(self, listings, next_page_url=None):
+        links = ''.join(
+            f'<a href="{escape(listing["ilanUrl"])}">{escape(listing["ilanNo"])}</a>'
+            for listing in listings
+        )
+        pagination = f'<a rel="next" href="{escape(next_page_url)}">Sonraki</a>' if next_page_url else ''
+        return (
+            '<!DOCTYPE html><html lang="tr"><head><meta charset="utf-8"><title>Emlak Ofisi | Emlakjet</title></head>'
+            f'<body><main><div class="styles_listings__Hn2Qx">{links}</div>{pagination}</main></body></html>'
+        )
+    
+    def write_fixtures(self, raw_file_path, output_dir, payload_dir=None):
+        """Write one snapshot per raw record in the format EmlakjetHtmlParser.parse_file reads.
+        
+        With payload_dir, the matching __NEXT_DATA__ payloads are saved there as <ilanNo>.json.
+        """
+        with open(raw_file_path, 'r', encoding='utf-8') as f:
+            raw_listings = json.load(f)
+        
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for record in raw_listings:
+            path = os.path.join(output_dir, f'{record["ilanNo"]}.html')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f'<!-- {record["ilanUrl"]} -->\n')
+                f.write(self.render_listing_page(record))
+            paths.append(path)
+            
+            if payload_dir:
+                os.makedirs(payload_dir, exist_ok=True)
+                with open(os.path.join(payload_dir, f'{record["ilanNo"]}.json'), 'w', encoding='utf-8') as f:
+                    json.dump(self.render_next_data(record), f, ensure_ascii=False, indent=2)
+        return paths
+
+def main():
+    renderer = EmlakjetFixtureRenderer()
+    paths = renderer.write_fixtures('emlakjet_listings_raw.json', 'fixtures', payload_dir='fixtures/next_data')
+    print(f"{len(paths)} fixture sayfası yazıldı: fixtures/")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from html import escape
+from html.parser import HTMLParser
+from emlakjet_listing_fields import EmlakjetListingFields
+
+# lxml is optional: with it the tree is built and searched in C, without it html.parser is used
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+TREE_BACKEND = 'lxml' if etree is not None else 'html.parser'
+
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'source', 'track', 'wbr'
+}
+
+BLOCK_ELEMENTS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt',
+    'fieldset', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'li', 'main', 'nav', 'ol', 'section', 'table', 'tr', 'ul'
+}
+
+RAW_TEXT_ELEMENTS = {'script', 'style'}
+
+SELECTOR_PATTERN = re.compile(r'^([a-zA-Z0-9]*)((?:\.[\w-]+)*)((?:\[[\w-]+\*?="[^"]*"\])*)$')
+ATTRIBUTE_PATTERN = re.compile(r'\[([\w-]+)(\*?=)"([^"]*)"\]')
+
+@lru_cache(maxsize=None)
+def parse_selector(selector):
+    match = SELECTOR_PATTERN.match(selector)
+    if not match:
+        raise ValueError(f'Unsupported selector: {selector}')
+    
+    tag, class_part, attribute_part = match.groups()
+    return tag, class_part.split('.')[1:], ATTRIBUTE_PATTERN.findall(attribute_part)
+
+@lru_cache(maxsize=None)
+def selector_xpath(selector):
+    """Compile a compound selector to an XPath over the descendants, with HtmlNode.matches semantics"""
+    tag, class_names, attributes = parse_selector(selector)
+    conditions = [f'contains(concat(" ", normalize-space(@class), " "), " {name} ")' for name in class_names]
+    for name, operator, expected in attributes:
+        conditions.append(f'contains(@{name}, "{expected}")' if operator == '*=' else f'@{name}="{expected}"')
+    return etree.XPath(f'.//{tag or "*"}' + ''.join(f'[{condition}]' for condition in conditions))
+
+class HtmlNode:
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or []
+        self.parent = parent
+        self.children = []
+    
+    def get(self, name):
+        for key, value in self.attrs:
+            if key == name:
+                return value if value is not None else ''
+        return None
+    
+    def classes(self):
+        return (self.get('class') or '').split()
+    
+    def iter(self):
+        """Descendant elements in document order"""
+        stack = [child for child in reversed(self.children) if isinstance(child, HtmlNode)]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for child in reversed(node.children) if isinstance(child, HtmlNode))
+    
+    def element_children(self):
+        return [child for child in self.children if isinstance(child, HtmlNode)]
+    
+    def following_siblings(self):
+        if not self.parent:
+            return []
+        siblings = self.parent.element_children()
+        return siblings[siblings.index(self) + 1:]
+    
+    def first_text(self):
+        """XPath text() semantics: the first direct text node"""
+        for child in self.children:
+            if isinstance(child, str):
+                return child
+        return ''
+    
+    def text_content(self):
+        return ''.join(
+            child if isinstance(child, str) else child.text_content()
+            for child in self.children
+        )
+    
+    def inner_html(self):
+        return ''.join(self.serialize(child) for child in self.children)
+    
+    def serialize(self, node):
+        if isinstance(node, str):
+            if self.tag in RAW_TEXT_ELEMENTS:
+                return node
+            return escape(node, quote=False).replace('\xa0', '&nbsp;')
+        
+        attrs = ''.join(
+            f' {key}="{(value or "").replace("&", "&amp;").replace(chr(0xa0), "&nbsp;").replace(chr(34), "&quot;")}"'
+            for key, value in node.attrs
+        )
+        if node.tag in VOID_ELEMENTS:
+            return f'<{node.tag}{attrs}>'
+        return f'<{node.tag}{attrs}>{node.inner_html()}</{node.tag}>'
+    
+    def inner_text(self):
+        """Approximate the browser's innerText: collapsed whitespace, line breaks around blocks"""
+        parts = []
+        self.collect_text(parts)
+        
+        lines = []
+        current = []
+        for part in parts:
+            if isinstance(part, int):
+                lines.append(''.join(current))
+                current = []
+                lines.extend([None] * (part - 1))
+            else:
+                current.append(part)
+        lines.append(''.join(current))
+        
+        text = []
+        pending_breaks = 0
+        for line in lines:
+            if line is None:
+                pending_breaks += 1
+                continue
+            line = line.strip(' ')
+            if not line:
+                continue
+            if text:
+                text.append('\n' * max(1, pending_breaks))
+            text.append(line)
+            pending_breaks = 0
+        return ''.join(text)
+    
+    def collect_text(self, parts):
+        for child in self.children:
+            if isinstance(child, str):
+                if self.tag not in RAW_TEXT_ELEMENTS:
+                    parts.append(re.sub(r'[ \t\n\r\f]+', ' ', child))
+            elif child.tag == 'br':
+                parts.append(1)
+            elif child.tag in BLOCK_ELEMENTS or child.tag == 'p':
+                breaks = 2 if child.tag == 'p' else 1
+                parts.append(breaks)
+                child.collect_text(parts)
+                parts.append(breaks)
+            else:
+                child.collect_text(parts)
+    
+    def matches(self, selector):
+        """Match a compound selector: tag, .class and [attr="v"] / [attr*="v"]"""
+        tag, class_names, attributes = parse_selector(selector)
+        if tag and self.tag != tag:
+            return False
+        
+        if class_names:
+            classes = self.classes()
+            for class_name in class_names:
+                if class_name not in classes:
+                    return False
+        
+        for name, operator, expected in attributes:
+            value = self.get(name)
+            if value is None:
+                return False
+            if operator == '*=' and expected not in value:
+                return False
+            if operator == '=' and value != expected:
+                return False
+        return True
+    
+    def select(self, selector):
+        return [node for node in self.iter() if node.matches(selector)]
+    
+    def select_one(self, selector):
+        for node in self.iter():
+            if node.matches(selector):
+                return node
+        return None
+
+class LxmlNode:
+    """The HtmlNode interface over an lxml element; text and markup go through a converted HtmlNode subtree"""
+    
+    def __init__(self, element):
+        self.element = element
+        self.tag = element.tag
+    
+    @property
+    def parent(self):
+        parent = self.element.getparent()
+        return LxmlNode(parent) if parent is not None else None
+    
+    def get(self, name):
+        return self.element.get(name)
+    
+    def iter(self):
+        return (LxmlNode(element) for element in self.element.iterdescendants() if isinstance(element.tag, str))
+    
+    def element_children(self):
+        return [LxmlNode(element) for element in self.element if isinstance(element.tag, str)]
+    
+    def following_siblings(self):
+        return [LxmlNode(element) for element in self.element.itersiblings() if isinstance(element.tag, str)]
+    
+    def html_node(self):
+        return convert_lxml(self.element)
+    
+    def first_text(self):
+        return self.html_node().first_text()
+    
+    def text_content(self):
+        return self.html_node().text_content()
+    
+    def inner_html(self):
+        return self.html_node().inner_html()
+    
+    def inner_text(self):
+        return self.html_node().inner_text()
+    
+    def select(self, selector):
+        return [LxmlNode(element) for element in selector_xpath(selector)(self.element)]
+    
+    def select_one(self, selector):
+        elements = selector_xpath(selector)(self.element)
+        return LxmlNode(elements[0]) if elements else None
+
+def convert_lxml(element, parent=None):
+    """HtmlNode copy of an lxml subtree; comments are dropped but their tail text is kept, like html.parser"""
+    node = HtmlNode(element.tag, element.items(), parent)
+    if element.text and isinstance(element.tag, str):
+        node.children.append(element.text)
+    for child in element:
+        if isinstance(child.tag, str):
+            node.children.append(convert_lxml(child, node))
+        if child.tail:
+            node.children.append(child.tail)
+    return node
+
+class HtmlTreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = HtmlNode('#document')
+        self.current = self.root
+    
+    def handle_starttag(self, tag, attrs):
+        node = HtmlNode(tag, attrs, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self.current = node
+    
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(HtmlNode(tag, attrs, self.current))
+    
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+    
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+class EmlakjetHtmlParser:
+    def __init__(self):
+        self.fields = EmlakjetListingFields()
+    
+    def build_tree(self, html):
+        document = etree.HTML(html) if etree is not None else None
+        if document is not None:
+            return LxmlNode(document)
+        
+        builder = HtmlTreeBuilder()
+        builder.feed(html)
+        builder.close()
+        return builder.root
+    
+    def parse(self, html, listing_url=None):
+        """Extract the same structure as extract_all_ilan_data from a page snapshot"""
+        try:
+            root = self.build_tree(html)
+            container = root.select_one('[id="ilan-hakkinda"]')
+            if not container:
+                return None
+            
+            result = {
+                'ilan_bilgileri': {},
+                'ilan_aciklamasi_html': None,
+                'ilan_ozellikleri': {
+                    'ic_ozellikler': {},
+                    'dis_ozellikler': {},
+                    'konum_ozellikleri': {}
+                },
+                'fiyat_bilgileri': {}
+            }
+            
+            self.extract_ilan_bilgileri(container, result['ilan_bilgileri'])
+            self.extract_fiyat_bilgileri(root, result['fiyat_bilgileri'])
+            self.extract_ilan_aciklamasi(container, result)
+            self.extract_ilan_ozellikleri(root, container, result['ilan_ozellikleri'])
+            
+            if listing_url:
+                result['ilanUrl'] = listing_url
+                result['ilanNo'] = re.search(r'-(\d+)$', listing_url).group(1)
+            return result
+        except Exception as e:
+            print(f"HTML parse error: {e}")
+            return None
+    
+    def first_matching_selector(self, nodes, selectors):
+        return next((selector for selector in selectors if any(node.select_one(selector) for node in nodes)), None)
+    
+    def extract_ilan_bilgileri(self, container, bilgiler):
+        items = [item for item in container.select('li') if item.parent and item.parent.tag == 'ul']
+        key_selector = self.first_matching_selector(items, self.fields.INFO_KEY_SELECTORS)
+        value_selector = self.first_matching_selector(items, self.fields.INFO_VALUE_SELECTORS)
+        if not key_selector or not value_selector:
+            return
+        
+        for item in items:
+            key_span = item.select_one(key_selector)
+            value_span = item.select_one(value_selector)
+            if key_span and value_span:
+                field_name = self.fields.map_key_to_field(key_span.inner_text().strip())
+                if field_name:
+                    bilgiler[field_name] = value_span.inner_text().strip()
+    
+    def extract_fiyat_bilgileri(self, root, fiyat_bilgileri):
+        for selector in self.fields.PRICE_SELECTORS:
+            price_elem = root.select_one(selector)
+            if price_elem:
+                price_text = price_elem.inner_text()
+                if price_text and price_text.strip():
+                    self.fields.parse_price_text(price_text, fiyat_bilgileri)
+                    return
+        
+        title = root.select_one('title')
+        self.fields.parse_price_title(title.text_content().strip() if title else None, fiyat_bilgileri)
+        
+        if not fiyat_bilgileri.get('fiyat'):
+            fiyat_bilgileri['fiyat'] = None
+            fiyat_bilgileri['not'] = 'Fiyat bilgisi bulunamadı'
+    
+    def extract_ilan_aciklamasi(self, container, result):
+        for heading in container.select('h2'):
+            if 'İlan Açıklaması' not in heading.first_text():
+                continue
+            for sibling in heading.following_siblings():
+                if sibling.tag != 'div':
+                    continue
+                inner = sibling.select_one('div[class*="styles_inner"]')
+                if inner:
+                    result['ilan_aciklamasi_html'] = inner.inner_html()
+                    return
+    
+    def extract_ilan_ozellikleri(self, root, container, ozellikler):
+        """Fill every feature tab whose panel markup is present in the snapshot"""
+        heading = next((node for node in container.select('h2')
+                        if 'İlan Özellikleri' in node.text_content()), None)
+        if not heading:
+            heading = next((node for node in root.select('h2')
+                            if 'İlan Özellikleri' in node.first_text()), None)
+        if not heading or not heading.parent:
+            print("İlan Özellikleri section bulunamadı")
+            return
+        
+        section = heading.parent
+        panels = section.select('div[role="tabpanel"]')
+        buttons = section.select('button')
+        if not panels:
+            print("Active tab bulunamadı: ic_ozellikler")
+            return
+        
+        tabs = [
+            ('ic_ozellikler', 'İç Özellikler'),
+            ('dis_ozellikler', 'Dış Özellikler'),
+            ('konum_ozellikleri', 'Konum Özellikleri')
+        ]
+        for tab_key, tab_text in tabs:
+            index = next((i for i, button in enumerate(buttons) if tab_text in button.text_content()), None)
+            if len(panels) == len(buttons) and index is not None:
+                panel = panels[index]
+            elif tab_key == 'ic_ozellikler':
+                panel = section.select_one('div[role="tabpanel"][data-headlessui-state="selected"]') or panels[0]
+            else:
+                continue
+            self.extract_tab_ozellikleri(panel, ozellikler[tab_key])
+    
+    def extract_tab_ozellikleri(self, panel, target_dict):
+        selector = self.first_matching_selector([panel], self.fields.TAB_TITLE_SELECTORS)
+        if not selector:
+            return
+        
+        for category in panel.select(selector):
+            lists = [node for node in category.following_siblings() if node.tag == 'ul']
+            feature_list = next((node for node in lists if 'tabContentList' in (node.get('class') or '')), None)
+            if not feature_list and lists:
+                feature_list = lists[0]
+            if feature_list:
+                features = [item.inner_text().strip() for item in feature_list.select('li')]
+                if features:
+                    target_dict[category.inner_text().strip()] = features
+    
+    def parse_file(self, path):
+        """Parse a snapshot saved by the scraper; the first line holds the listing URL"""
+        with open(path, 'r', encoding='utf-8') as f:
+            listing_url = f.readline().strip()[len('<!-- '):-len(' -->')] or None
+            html = f.read()
+        return self.parse(html, listing_url)
+    
+    def parse_snapshot_dir(self, snapshot_dir, processes=None):
+        """Parse every snapshot in a directory, across a process pool when processes > 1"""
+        paths = sorted(
+            os.path.join(snapshot_dir, name)
+            for name in os.listdir(snapshot_dir)
+            if name.endswith('.html')
+        )
+        
+        if processes and processes > 1:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(parse_snapshot_file, paths, chunksize=16))
+        else:
+            results = [self.parse_file(path) for path in paths]
+        
+        return [result for result in results if result]
+
+# One parser per worker process, built on its first snapshot
+worker_parser = None
+
+def parse_snapshot_file(path):
+    global worker_parser
+    if worker_parser is None:
+        worker_parser = EmlakjetHtmlParser()
+    return worker_parser.parse_file(path)
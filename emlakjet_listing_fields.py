@@ -0,0 +1,75 @@
+import re
+
+class EmlakjetListingFields:
+    """Field labels, selector fallbacks and price parsing shared by the browser, HTML and JSON extractors"""
+    
+    PRICE_EXACT_SELECTORS = [
+        'span.n-prop-detail-price',
+        'div.price',
+        'span.price',
+        'div.fiyat',
+        'span.fiyat'
+    ]
+    
+    PRICE_SELECTORS = PRICE_EXACT_SELECTORS + [
+        'div[class*="price"]',
+        'span[class*="price"]',
+        'div[class*="fiyat"]',
+        'span[class*="fiyat"]'
+    ]
+    
+    # Hashed class names change on redeploys; the prefix matches are the fallbacks
+    INFO_KEY_SELECTORS = ['span.styles_key__wX_g4', 'span[class*="styles_key__"]']
+    INFO_VALUE_SELECTORS = ['span.styles_value__xmNV3', 'span[class*="styles_value__"]']
+    TAB_TITLE_SELECTORS = ['div.styles_tabContentTitle__3Q2jN', 'div[class*="tabContentTitle"]']
+    
+    FIELD_MAPPING = {
+        'İlan Numarası': 'ilan_numarasi',
+        'İlan Güncelleme Tarihi': 'ilan_guncelleme_tarihi',
+        'Türü': 'turu',
+        'Kategorisi': 'kategorisi',
+        'Tipi': 'tipi',
+        'Net Metrekare': 'net_metrekare',
+        'Brüt Metrekare': 'brut_metrekare',
+        'Oda Sayısı': 'oda_sayisi',
+        'Binanın Yaşı': 'bina_yasi',
+        'Bulunduğu Kat': 'bulundugu_kat',
+        'Binanın Kat Sayısı': 'toplam_kat_sayisi',
+        'Isıtma Tipi': 'isitma_tipi',
+        'Kullanım Durumu': 'kullanim_durumu',
+        'Krediye Uygunluk': 'krediye_uygunluk',
+        'Tapu Durumu': 'tapu_durumu',
+        'Site İçerisinde': 'site_icerisinde',
+        'Banyo Sayısı': 'banyo_sayisi',
+        'Fiyat Durumu': 'fiyat_durumu'
+    }
+    
+    def map_key_to_field(self, key_text):
+        return self.FIELD_MAPPING.get(key_text)
+    
+    def parse_price_text(self, price_text, fiyat_bilgileri):
+        fiyat_bilgileri['fiyat_text'] = price_text.strip()
+        
+        # Extract numeric value
+        price_match = re.search(r'[\d.]+', price_text.replace('.', ''))
+        if price_match:
+            fiyat_bilgileri['fiyat'] = int(price_match.group().replace('.', ''))
+        
+        # Extract currency
+        if 'TL' in price_text or '₺' in price_text:
+            fiyat_bilgileri['para_birimi'] = 'TL'
+        elif '$' in price_text:
+            fiyat_bilgileri['para_birimi'] = 'USD'
+        elif '€' in price_text:
+            fiyat_bilgileri['para_birimi'] = 'EUR'
+    
+    def parse_price_title(self, title, fiyat_bilgileri):
+        if not title:
+            return
+        
+        price_match = re.search(r'([\d.]+)\s*(?:TL|₺|\$|€)', title)
+        if price_match:
+            fiyat_bilgileri['fiyat_text'] = price_match.group(0)
+            fiyat_bilgileri['fiyat'] = int(price_match.group(1).replace('.', ''))
+            if 'TL' in price_match.group(0) or '₺' in price_match.group(0):
+                fiyat_bilgileri['para_birimi'] = 'TL'
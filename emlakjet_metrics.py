@@ -0,0 +1,121 @@
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Record of the listing the current asyncio task is working on
+current_listing = ContextVar('current_listing', default=None)
+
+class EmlakjetMetrics:
+    """Per-listing phase timings, retries and failures, exported as JSON lines"""
+    
+    def __init__(self, metrics_path=None):
+        self.metrics_path = metrics_path
+        self.metrics_file = None
+        self.records = []
+        self.failures = []
+        self.retries = []
+    
+    def open(self):
+        if self.metrics_path:
+            self.metrics_file = open(self.metrics_path, 'w', encoding='utf-8')
+    
+    def close(self):
+        if self.metrics_file:
+            self.metrics_file.close()
+            self.metrics_file = None
+    
+    def start_listing(self, listing_url, listing_no=None, retries=0):
+        record = {
+            'ilanNo': listing_no,
+            'ilanUrl': listing_url,
+            'status': 'ok',
+            'seconds': None,
+            'phases': {},
+            'retries': retries,
+            'failures': [],
+            'bytes': 0,
+            'requests': 0,
+            'time_to_ilan_hakkinda': None,
+            'started_at': time.time()
+        }
+        record['_started'] = time.perf_counter()
+        current_listing.set(record)
+        return record
+    
+    def finish_listing(self, record, status=None):
+        if status:
+            record['status'] = status
+        record['seconds'] = round(time.perf_counter() - record.pop('_started'), 3)
+        current_listing.set(None)
+        
+        self.records.append(record)
+        if self.metrics_file:
+            self.metrics_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self.metrics_file.flush()
+    
+    @contextmanager
+    def phase(self, name):
+        """Time a block against the current listing; the first failing phase is remembered"""
+        record = current_listing.get()
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            if record is not None:
+                record.setdefault('failed_phase', name)
+            raise
+        finally:
+            if record is not None:
+                record['phases'][name] = round(record['phases'].get(name, 0) + time.perf_counter() - started, 3)
+    
+    def failure(self, phase, error, listing=None):
+        """Record a handled error instead of swallowing it; `listing` attributes it when no record is current"""
+        failure = {'phase': phase, 'type': type(error).__name__, 'message': str(error)[:200]}
+        record = current_listing.get()
+        if record is not None:
+            failure['ilanNo'] = record['ilanNo']
+            failure['ilanUrl'] = record['ilanUrl']
+            record['failures'].append(failure)
+        elif listing is not None:
+            failure['ilanNo'] = listing['ilanNo']
+            failure['ilanUrl'] = listing['ilanUrl']
+        self.failures.append(failure)
+    
+    def retry(self, listing_no, attempt, delay):
+        self.retries.append({'ilanNo': listing_no, 'attempt': attempt, 'delay': round(delay, 3)})
+    
+    def percentiles(self, values):
+        values = sorted(values)
+        if not values:
+            return {'p50': None, 'p95': None}
+        return {
+            'p50': values[len(values) // 2],
+            'p95': values[min(len(values) - 1, int(len(values) * 0.95))]
+        }
+    
+    def summary(self):
+        """p50/p95 per listing and per phase, failures grouped by exception type and phase"""
+        phases = {}
+        for record in self.records:
+            for name, seconds in record['phases'].items():
+                phases.setdefault(name, []).append(seconds)
+        
+        failures_by_type = {}
+        failures_by_phase = {}
+        for failure in self.failures:
+            failures_by_type[failure['type']] = failures_by_type.get(failure['type'], 0) + 1
+            failures_by_phase[failure['phase']] = failures_by_phase.get(failure['phase'], 0) + 1
+        
+        return {
+            'listings': len(self.records),
+            'failed': sum(1 for record in self.records if record['status'] == 'failed'),
+            'retries': len(self.retries),
+            'seconds': self.percentiles(record['seconds'] for record in self.records),
+            'phases': {
+                name: dict(self.percentiles(values), total=round(sum(values), 3))
+                for name, values in sorted(phases.items(), key=lambda item: -sum(item[1]))
+            },
+            'failures_by_type': failures_by_type,
+            'failures_by_phase': failures_by_phase
+        }
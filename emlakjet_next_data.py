@@ -0,0 +1,136 @@
+import json
+import re
+from emlakjet_listing_fields import EmlakjetListingFields
+
+NEXT_DATA_PATTERN = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+
+LABEL_KEYS = ('key', 'label', 'name', 'title')
+VALUE_KEYS = ('value', 'text', 'displayValue')
+DESCRIPTION_KEYS = ('descriptionHtml', 'description', 'aciklama')
+PRICE_KEYS = ('price', 'fiyat')
+CURRENCIES = {'TL': 'TL', 'TRY': 'TL', '₺': 'TL', 'USD': 'USD', '$': 'USD', 'EUR': 'EUR', '€': 'EUR'}
+
+class EmlakjetNextDataExtractor:
+    """Map an embedded __NEXT_DATA__ (or XHR) JSON payload to the extract_all_ilan_data structure.
+    
+    The payload layout is not fixed, so the listing is located by content: a list of
+    label/value pairs whose labels are İlan Bilgileri keys, feature groups named like the
+    tabs, and price/description keys next to them.
+    """
+    
+    TAB_LABELS = {
+        'İç Özellikler': 'ic_ozellikler',
+        'Dış Özellikler': 'dis_ozellikler',
+        'Konum Özellikleri': 'konum_ozellikleri'
+    }
+    
+    def __init__(self):
+        self.fields = EmlakjetListingFields()
+    
+    def find_payload(self, html):
+        match = NEXT_DATA_PATTERN.search(html or '')
+        if not match:
+            return None
+        try:
+            return json.loads(match.group(1))
+        except ValueError:
+            return None
+    
+    def extract_html(self, html):
+        return self.extract(self.find_payload(html))
+    
+    def iter_dicts(self, value):
+        stack = [value]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                yield value
+                stack.extend(reversed(list(value.values())))
+            elif isinstance(value, list):
+                stack.extend(reversed(value))
+    
+    def label_value(self, item):
+        if not isinstance(item, dict):
+            return None, None
+        label = next((item[k] for k in LABEL_KEYS if isinstance(item.get(k), str)), None)
+        value = next((item[k] for k in VALUE_KEYS if item.get(k) is not None), None)
+        return label, value
+    
+    def find_listing(self, payload):
+        """The dict holding the İlan Bilgileri pairs, plus the list key they live under"""
+        for node in self.iter_dicts(payload):
+            for key, items in node.items():
+                if not isinstance(items, list):
+                    continue
+                mapped = sum(1 for item in items if self.fields.map_key_to_field(self.label_value(item)[0]))
+                if mapped >= 2:
+                    return node, key
+        return None, None
+    
+    def extract(self, payload):
+        if not payload:
+            return None
+        
+        listing, info_key = self.find_listing(payload)
+        if listing is None:
+            return None
+        
+        result = {
+            'ilan_bilgileri': {},
+            'ilan_aciklamasi_html': None,
+            'ilan_ozellikleri': {
+                'ic_ozellikler': {},
+                'dis_ozellikler': {},
+                'konum_ozellikleri': {}
+            },
+            'fiyat_bilgileri': {}
+        }
+        
+        for item in listing[info_key]:
+            label, value = self.label_value(item)
+            field_name = self.fields.map_key_to_field((label or '').strip())
+            if field_name and value is not None:
+                result['ilan_bilgileri'][field_name] = str(value).strip()
+        
+        result['ilan_aciklamasi_html'] = next(
+            (listing[k] for k in DESCRIPTION_KEYS if isinstance(listing.get(k), str)), None
+        )
+        self.extract_ozellikler(listing, result['ilan_ozellikleri'])
+        self.extract_fiyat(next((listing[k] for k in PRICE_KEYS if k in listing), None), result['fiyat_bilgileri'])
+        return result
+    
+    def extract_ozellikler(self, listing, ozellikler):
+        for node in self.iter_dicts(listing):
+            label, _ = self.label_value(node)
+            tab_key = self.TAB_LABELS.get((label or '').strip())
+            if not tab_key:
+                continue
+            
+            categories = next((v for v in node.values() if isinstance(v, list)), [])
+            for category in categories:
+                category_name, _ = self.label_value(category)
+                features = next((v for v in category.values() if isinstance(v, list)), []) if isinstance(category, dict) else []
+                features = [
+                    (feature if isinstance(feature, str) else self.label_value(feature)[0] or '').strip()
+                    for feature in features
+                ]
+                features = [feature for feature in features if feature]
+                if category_name and features:
+                    ozellikler[tab_key][category_name.strip()] = features
+    
+    def extract_fiyat(self, price, fiyat_bilgileri):
+        """Same keys the DOM path produces via parse_price_text"""
+        if isinstance(price, dict) and price.get('text'):
+            self.fields.parse_price_text(price['text'], fiyat_bilgileri)
+            return
+        
+        value = price.get('value', price.get('amount')) if isinstance(price, dict) else price
+        if isinstance(value, (int, float)):
+            currency = CURRENCIES.get(price.get('currency'), 'TL') if isinstance(price, dict) else 'TL'
+            fiyat_bilgileri['fiyat_text'] = f'{int(value):,} {currency}'.replace(',', '.')
+            fiyat_bilgileri['fiyat'] = int(value)
+            fiyat_bilgileri['para_birimi'] = currency
+            return
+        
+        fiyat_bilgileri['fiyat'] = None
+        fiyat_bilgileri['not'] = 'Fiyat bilgisi bulunamadı'
@@ -0,0 +1,87 @@
+import json
+import os
+import time
+
+class EmlakjetPageCache:
+    def __init__(self, cache_dir='cache', max_bytes=500 * 1024 * 1024, max_age_days=30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 24 * 3600
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'bytes_saved': 0,
+            'evicted': 0
+        }
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def entry_path(self, listing_no):
+        return os.path.join(self.cache_dir, f'{listing_no}.json')
+    
+    def get(self, listing_no, update_date):
+        """Cached record if the firm page update date matches the stored one"""
+        entry = self.load_entry(listing_no) if update_date else None
+        
+        if entry and entry.get('ilan_guncelleme_tarihi') == update_date:
+            if time.time() - entry['stored_at'] <= self.max_age_seconds:
+                self.stats['hits'] += 1
+                self.stats['bytes_saved'] += entry.get('html_bytes', 0)
+                return entry['record']
+        
+        self.stats['misses'] += 1
+        return None
+    
+    def load_entry(self, listing_no):
+        try:
+            with open(self.entry_path(listing_no), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, listing_no, record, html=None):
+        entry = {
+            'ilanNo': listing_no,
+            'stored_at': time.time(),
+            'ilan_guncelleme_tarihi': record.get('ilan_bilgileri', {}).get('ilan_guncelleme_tarihi'),
+            'html_bytes': len(html.encode('utf-8')) if html else 0,
+            'html': html,
+            'record': record
+        }
+        
+        path = self.entry_path(listing_no)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+    
+    def evict(self):
+        """Drop entries past max_age, then the oldest ones until the cache fits in max_bytes"""
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            stat = os.stat(path)
+            if now - stat.st_mtime > self.max_age_seconds:
+                os.remove(path)
+                self.stats['evicted'] += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+        
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            os.remove(path)
+            total_bytes -= size
+            self.stats['evicted'] += 1
+    
+    def summary(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            'hits': self.stats['hits'],
+            'misses': self.stats['misses'],
+            'hit_ratio': round(self.stats['hits'] / lookups, 3) if lookups else 0.0,
+            'bytes_saved': self.stats['bytes_saved'],
+            'evicted': self.stats['evicted']
+        }
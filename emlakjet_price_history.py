@@ -0,0 +1,130 @@
+import sqlite3
+import time
+
+class EmlakjetPriceHistory:
+    """Per-ilanNo history of price and key fields, stored only as change events"""
+    
+    TRACKED_FIELDS = ['fiyat', 'm2Net', 'kullanim_durumu', 'fiyat_durumu']
+    NUMERIC_FIELDS = {'fiyat', 'm2Net'}
+    
+    def __init__(self, db_path='emlakjet_listings.db'):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.create_schema()
+    
+    def create_schema(self):
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS history_state ('
+                'ilanNo TEXT, field TEXT, value TEXT, observed_at REAL, PRIMARY KEY (ilanNo, field))'
+            )
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS history_events ('
+                'ilanNo TEXT, field TEXT, old_value TEXT, new_value TEXT, change_pct REAL, observed_at REAL)'
+            )
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_history_events_field_time ON history_events (field, observed_at)'
+            )
+            self.connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_history_events_listing ON history_events (ilanNo, field, observed_at)'
+            )
+    
+    def change_pct(self, field, old_value, new_value):
+        if field not in self.NUMERIC_FIELDS or old_value is None or new_value is None:
+            return None
+        old_number = float(old_value)
+        if not old_number:
+            return None
+        return round((float(new_value) - old_number) / old_number * 100, 2)
+    
+    def record_many(self, observations, observed_at=None):
+        """Store (ilanNo, {field: value}) observations; only changed values become events.
+        
+        Missing (None) values are skipped: a partial record says nothing about the field.
+        """
+        observed_at = observed_at or time.time()
+        events = 0
+        
+        with self.connection:
+            for listing_no, values in observations:
+                current = dict(self.connection.execute(
+                    'SELECT field, value FROM history_state WHERE ilanNo = ?', (listing_no,)
+                ).fetchall())
+                
+                for field in self.TRACKED_FIELDS:
+                    value = values.get(field)
+                    if value is None:
+                        continue
+                    
+                    new_value = str(value)
+                    if field in current and current[field] == new_value:
+                        continue
+                    
+                    old_value = current.get(field)
+                    self.connection.execute(
+                        'INSERT INTO history_events VALUES (?, ?, ?, ?, ?, ?)',
+                        (listing_no, field, old_value, new_value,
+                         self.change_pct(field, old_value, new_value), observed_at)
+                    )
+                    self.connection.execute(
+                        'INSERT OR REPLACE INTO history_state VALUES (?, ?, ?, ?)',
+                        (listing_no, field, new_value, observed_at)
+                    )
+                    events += 1
+        return events
+    
+    def history(self, listing_no, field=None):
+        sql = 'SELECT field, old_value, new_value, change_pct, observed_at FROM history_events WHERE ilanNo = ?'
+        params = [listing_no]
+        if field:
+            sql += ' AND field = ?'
+            params.append(field)
+        rows = self.connection.execute(sql + ' ORDER BY observed_at', params)
+        return [
+            {'field': f, 'old_value': old, 'new_value': new, 'change_pct': pct, 'observed_at': at}
+            for f, old, new, pct, at in rows
+        ]
+    
+    def price_drops(self, min_drop_pct=5, days=30, now=None):
+        """Listings whose price fell by more than min_drop_pct over the last `days` days"""
+        now = now or time.time()
+        cutoff = now - days * 24 * 3600
+        
+        # Baseline: the last price before the window, else the first price ever seen
+        rows = self.connection.execute(
+            'WITH events AS ('
+            '  SELECT ilanNo, old_value, new_value, observed_at,'
+            '    ROW_NUMBER() OVER (PARTITION BY ilanNo ORDER BY observed_at) AS first_rank,'
+            '    ROW_NUMBER() OVER (PARTITION BY ilanNo, observed_at < :cutoff ORDER BY observed_at DESC) AS last_rank'
+            '  FROM history_events'
+            '  WHERE field = :field AND ilanNo IN ('
+            '    SELECT ilanNo FROM history_events'
+            '    WHERE field = :field AND observed_at >= :cutoff AND old_value IS NOT NULL'
+            '  )'
+            ') '
+            'SELECT events.ilanNo,'
+            '  CASE WHEN MAX(events.observed_at < :cutoff)'
+            '    THEN MAX(CASE WHEN events.observed_at < :cutoff AND last_rank = 1 THEN new_value END)'
+            '    ELSE MAX(CASE WHEN first_rank = 1 THEN COALESCE(old_value, new_value) END)'
+            '  END,'
+            '  state.value '
+            'FROM events LEFT JOIN history_state state ON state.ilanNo = events.ilanNo AND state.field = :field '
+            'GROUP BY events.ilanNo',
+            {'field': 'fiyat', 'cutoff': cutoff}
+        )
+        
+        drops = []
+        for listing_no, baseline, current in rows:
+            pct = self.change_pct('fiyat', baseline, current)
+            if pct is not None and pct < -min_drop_pct:
+                drops.append({
+                    'ilanNo': listing_no,
+                    'old_fiyat': int(baseline),
+                    'fiyat': int(current),
+                    'change_pct': pct
+                })
+        return sorted(drops, key=lambda drop: (drop['change_pct'], drop['ilanNo']))
+    
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,67 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+class EmlakjetRateLimiter:
+    def __init__(self, requests_per_second=0.5, burst=1, max_in_flight=4):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.buckets = {}
+        self.stats = {
+            'requests': 0,
+            'wait_seconds': 0.0
+        }
+    
+    def get_bucket(self, url):
+        """Token bucket and in-flight semaphore for the URL's host"""
+        host = urlparse(url).netloc
+        bucket = self.buckets.get(host)
+        if not bucket:
+            bucket = {
+                'tokens': float(self.burst),
+                'updated': time.monotonic(),
+                'lock': asyncio.Lock(),
+                'semaphore': asyncio.Semaphore(self.max_in_flight)
+            }
+            self.buckets[host] = bucket
+        return bucket
+    
+    async def acquire(self, url):
+        started = time.monotonic()
+        bucket = self.get_bucket(url)
+        await bucket['semaphore'].acquire()
+        
+        try:
+            async with bucket['lock']:
+                while self.requests_per_second:
+                    now = time.monotonic()
+                    bucket['tokens'] = min(
+                        float(self.burst),
+                        bucket['tokens'] + (now - bucket['updated']) * self.requests_per_second
+                    )
+                    bucket['updated'] = now
+                    
+                    if bucket['tokens'] >= 1:
+                        bucket['tokens'] -= 1
+                        break
+                    
+                    await asyncio.sleep((1 - bucket['tokens']) / self.requests_per_second)
+        except BaseException:
+            bucket['semaphore'].release()
+            raise
+        
+        self.stats['requests'] += 1
+        self.stats['wait_seconds'] += time.monotonic() - started
+    
+    def release(self, url):
+        self.get_bucket(url)['semaphore'].release()
+    
+    @asynccontextmanager
+    async def slot(self, url):
+        await self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(url)
@@ -0,0 +1,101 @@
+import json
+import os
+
+class EmlakjetSelectorRegistry:
+    """Fallback selector groups ordered by recent hits, plus per-field fill rates for degraded-run checks"""
+    
+    def __init__(self, state_path=None, min_fill_rate=0.8, min_samples=20, decay=0.98):
+        self.state_path = state_path
+        self.min_fill_rate = min_fill_rate
+        self.min_samples = min_samples
+        self.decay = decay
+        self.groups = {}
+        self.exact = {}
+        self.stats = {}
+        self.fills = {}
+        self.load()
+    
+    def load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self.stats = json.load(f).get('selectors', {})
+        except (OSError, ValueError):
+            self.stats = {}
+    
+    def save(self):
+        """Persist selector stats so the learned order carries over to the next run"""
+        if not self.state_path:
+            return
+        
+        with open(self.state_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'selectors': self.stats}, f, ensure_ascii=False, indent=2)
+        os.replace(self.state_path + '.tmp', self.state_path)
+    
+    def register(self, group, selectors, exact=1):
+        """The first `exact` selectors are specific matches and always come before the generic fallbacks"""
+        self.groups[group] = list(selectors)
+        self.exact[group] = exact
+        stats = self.stats.setdefault(group, {})
+        for selector in selectors:
+            stats.setdefault(selector, {'tries': 0, 'hits': 0, 'score': 0.0})
+    
+    def ordered(self, group):
+        """Exact selectors before generic ones, then the highest decayed hit score first; ties keep the declared order"""
+        stats = self.stats[group]
+        selectors = self.groups[group]
+        exact = self.exact[group]
+        return sorted(selectors, key=lambda selector: (
+            selectors.index(selector) >= exact, -stats[selector]['score'], selectors.index(selector)
+        ))
+    
+    def record(self, group, tried, selector):
+        """`tried` is the order used; selector is the one that matched, or None if none did"""
+        stats = self.stats[group]
+        for entry in stats.values():
+            entry['score'] *= self.decay
+        
+        for candidate in tried:
+            stats[candidate]['tries'] += 1
+            if candidate == selector:
+                stats[candidate]['hits'] += 1
+                stats[candidate]['score'] += 1
+                break
+    
+    def observe_fill(self, field, filled):
+        fill = self.fills.setdefault(field, {'listings': 0, 'filled': 0})
+        fill['listings'] += 1
+        if filled:
+            fill['filled'] += 1
+    
+    def fill_rates(self):
+        return {
+            field: round(fill['filled'] / fill['listings'], 3)
+            for field, fill in self.fills.items() if fill['listings']
+        }
+    
+    def degraded_fields(self):
+        """Fields whose fill rate fell below min_fill_rate over at least min_samples listings"""
+        return sorted(
+            field for field, rate in self.fill_rates().items()
+            if self.fills[field]['listings'] >= self.min_samples and rate < self.min_fill_rate
+        )
+    
+    def summary(self):
+        return {
+            'fill_rates': self.fill_rates(),
+            'degraded_fields': self.degraded_fields(),
+            'selectors': {
+                group: [
+                    {
+                        'selector': selector,
+                        'hit_rate': round(self.stats[group][selector]['hits'] / self.stats[group][selector]['tries'], 3)
+                        if self.stats[group][selector]['tries'] else None
+                    }
+                    for selector in self.ordered(group)
+                ]
+                for group in self.groups
+            }
+        }
@@ -0,0 +1,138 @@
+import json
+import sqlite3
+import time
+
+class EmlakjetStorage:
+    """SQLite store for normalized listings with upserts keyed by ilanNo"""
+    
+    COLUMNS = [
+        ('ilanNo', 'TEXT PRIMARY KEY'),
+        ('ilanUrl', 'TEXT'),
+        ('m2Net', 'INTEGER'),
+        ('m2Brut', 'INTEGER'),
+        ('odaSayisi', 'TEXT'),
+        ('bulunduguKat', 'INTEGER'),
+        ('toplamKatSayisi', 'INTEGER'),
+        ('binaYasi', 'INTEGER'),
+        ('ilanDurumu', 'TEXT'),
+        ('isitmaSistemi', 'TEXT'),
+        ('siteIcerisinde', 'INTEGER'),
+        ('fiyat', 'INTEGER'),
+        ('ilanAciklamasiHtml', 'TEXT'),
+        ('ozellikler', 'TEXT'),
+        ('ilanAciklamasi', 'TEXT'),
+        ('ilanAciklamasiHash', 'TEXT'),
+        ('ozellikBitset', 'TEXT')
+    ]
+    
+    INDEXED_COLUMNS = ['fiyat', 'm2Net', 'odaSayisi', 'ilanDurumu']
+    
+    def __init__(self, db_path='emlakjet_listings.db'):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.create_schema()
+    
+    def create_schema(self):
+        columns = ', '.join(f'{name} {kind}' for name, kind in self.COLUMNS)
+        with self.connection:
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS listings ({columns}, updated_at REAL)')
+            existing = {row['name'] for row in self.connection.execute('PRAGMA table_info(listings)')}
+            for name, kind in self.COLUMNS:
+                if name not in existing:
+                    self.connection.execute(f'ALTER TABLE listings ADD COLUMN {name} {kind}')
+            for column in self.INDEXED_COLUMNS:
+                self.connection.execute(f'CREATE INDEX IF NOT EXISTS idx_listings_{column} ON listings ({column})')
+    
+    def record_to_row(self, record):
+        row = []
+        for name, _ in self.COLUMNS:
+            value = record.get(name)
+            if name == 'ozellikler':
+                value = json.dumps(value, ensure_ascii=False) if value is not None else None
+            elif name == 'siteIcerisinde' and value is not None:
+                value = int(value)
+            row.append(value)
+        row.append(time.time())
+        return row
+    
+    def row_to_record(self, row):
+        record = {name: row[name] for name, _ in self.COLUMNS}
+        if record['ozellikler'] is not None:
+            record['ozellikler'] = json.loads(record['ozellikler'])
+        if record['siteIcerisinde'] is not None:
+            record['siteIcerisinde'] = bool(record['siteIcerisinde'])
+        return record
+    
+    def upsert_many(self, records, batch_size=1000):
+        """Insert or update records in batched transactions; returns the number written"""
+        names = [name for name, _ in self.COLUMNS] + ['updated_at']
+        updates = ', '.join(f'{name} = excluded.{name}' for name in names if name != 'ilanNo')
+        sql = (
+            f'INSERT INTO listings ({", ".join(names)}) VALUES ({", ".join("?" for _ in names)}) '
+            f'ON CONFLICT(ilanNo) DO UPDATE SET {updates}'
+        )
+        
+        count = 0
+        batch = []
+        for record in records:
+            batch.append(self.record_to_row(record))
+            if len(batch) >= batch_size:
+                with self.connection:
+                    self.connection.executemany(sql, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            with self.connection:
+                self.connection.executemany(sql, batch)
+            count += len(batch)
+        return count
+    
+    def query(self, min_fiyat=None, max_fiyat=None, min_m2=None, max_m2=None, oda_sayisi=None, ilan_durumu=None):
+        """Listings matching every given filter, cheapest first"""
+        filters = []
+        params = []
+        for column, operator, value in [
+            ('fiyat', '>=', min_fiyat),
+            ('fiyat', '<=', max_fiyat),
+            ('m2Net', '>=', min_m2),
+            ('m2Net', '<=', max_m2),
+            ('odaSayisi', '=', oda_sayisi),
+            ('ilanDurumu', '=', ilan_durumu)
+        ]:
+            if value is not None:
+                filters.append(f'{column} {operator} ?')
+                params.append(value)
+        
+        where = f'WHERE {" AND ".join(filters)}' if filters else ''
+        rows = self.connection.execute(f'SELECT * FROM listings {where} ORDER BY fiyat', params)
+        return [self.row_to_record(row) for row in rows]
+    
+    def count(self):
+        return self.connection.execute('SELECT COUNT(*) FROM listings').fetchone()[0]
+    
+    def export_parquet(self, output_file, batch_size=50000):
+        """Columnar export for analytics; needs pyarrow"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        names = [name for name, _ in self.COLUMNS]
+        schema = pa.schema([
+            (name, pa.int64() if kind.startswith('INTEGER') else pa.string())
+            for name, kind in self.COLUMNS
+        ])
+        writer = pq.ParquetWriter(output_file, schema)
+        cursor = self.connection.execute(f'SELECT {", ".join(names)} FROM listings ORDER BY ilanNo')
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                writer.write_table(pa.table({name: [row[name] for row in rows] for name in names}, schema=schema))
+        finally:
+            writer.close()
+    
+    def close(self):
+        self.connection.close()
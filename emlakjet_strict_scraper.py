@@ -1,78 +1,461 @@
 import asyncio
 import json
+import os
+import random
 import re
+import sys
+import time
+import urllib.request
 from playwright.async_api import async_playwright
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
+from emlakjet_browser_pool import EmlakjetBrowserPool
+from emlakjet_checkpoint import EmlakjetCheckpoint
+from emlakjet_crawl_frontier import EmlakjetCrawlFrontier
+from emlakjet_database_normalizer import EmlakjetDatabaseNormalizer
+from emlakjet_listing_fields import EmlakjetListingFields
+from emlakjet_metrics import EmlakjetMetrics
+from emlakjet_next_data import EmlakjetNextDataExtractor
+from emlakjet_page_cache import EmlakjetPageCache
+from emlakjet_rate_limiter import EmlakjetRateLimiter
+from emlakjet_selector_registry import EmlakjetSelectorRegistry
 
-class EmlakjetStrictScraper:
-    def __init__(self):
+class EmlakjetStrictScraper(EmlakjetListingFields):
+    # Stylesheets stay enabled: innerText line breaks depend on layout
+    BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'texttrack', 'manifest'}
+    
+    # Optional conditions wait at most as long as the fixed sleeps they replaced (3s per page, 2s per tab)
+    OPTIONAL_WAIT_TIMEOUT = 3000
+    TAB_WAIT_TIMEOUT = 2000
+    
+    TRACKER_HOSTS = [
+        'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+        'googleadservices.com', 'facebook.net', 'facebook.com', 'hotjar.com', 'criteo.com',
+        'yandex.ru', 'clarity.ms', 'adform.net', 'tiktok.com', 'insider.com', 'segment.io'
+    ]
+    
+    PAGE_NUMBER_PATTERN = re.compile(r'[?&](?:sayfa|page)=(\d+)')
+    
+    UPDATE_DATE_PATTERN = re.compile(
+        r'\d{1,2} (?:Ocak|Şubat|Mart|Nisan|Mayıs|Haziran|Temmuz|Ağustos|Eylül|Ekim|Kasım|Aralık) \d{4}'
+    )
+    
+    LISTING_LINKS_SCRIPT = """() => ({
+        links: Array.from(document.querySelectorAll('a[href*="/ilan/"]')).map((link) => ({
+            href: link.getAttribute('href'),
+            card_text: (link.closest('li, article') || link).innerText
+        })),
+        pages: Array.from(document.querySelectorAll('a[rel="next"], a[href*="sayfa="], a[href*="page="]'))
+            .map((link) => link.getAttribute('href'))
+    })"""
+    
+    ILAN_BILGILERI_SCRIPT = """(container, [keySelectors, valueSelectors]) => {
+        const items = Array.from(container.querySelectorAll('ul > li'));
+        const pick = (selectors) => selectors.find((selector) => items.some((item) => item.querySelector(selector))) || null;
+        const keySelector = pick(keySelectors);
+        const valueSelector = pick(valueSelectors);
+        if (!keySelector || !valueSelector) {
+            return {pairs: [], key_selector: keySelector, value_selector: valueSelector};
+        }
+        return {
+            pairs: items.map((item) => [item.querySelector(keySelector), item.querySelector(valueSelector)])
+                .filter(([key, value]) => key && value)
+                .map(([key, value]) => [key.innerText, value.innerText]),
+            key_selector: keySelector,
+            value_selector: valueSelector
+        };
+    }"""
+    
+    FIYAT_SCRIPT = """(selectors) => {
+        for (const selector of selectors) {
+            const element = document.querySelector(selector);
+            if (element && element.innerText && element.innerText.trim()) {
+                return {price_text: element.innerText, title: null, selector: selector};
+            }
+        }
+        return {price_text: null, title: document.title, selector: null};
+    }"""
+    
+    ILAN_ACIKLAMASI_SCRIPT = """(container) => {
+        const node = document.evaluate(
+            './/h2[contains(text(), "İlan Açıklaması")]/following-sibling::div//div[contains(@class, "styles_inner")]',
+            container, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        return node ? node.innerHTML : null;
+    }"""
+    
+    TAB_OZELLIKLERI_SCRIPT = """(section, titleSelectors) => {
+        const panel = section.querySelector('div[role="tabpanel"][data-headlessui-state="selected"]')
+            || section.querySelector('div[role="tabpanel"]');
+        if (!panel) {
+            return null;
+        }
+        const firstNode = (xpath, context) => document.evaluate(
+            xpath, context, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        const selector = titleSelectors.find((candidate) => panel.querySelector(candidate)) || null;
+        if (!selector) {
+            return {categories: [], selector: null};
+        }
+        return {
+            categories: Array.from(panel.querySelectorAll(selector)).map((category) => {
+                const list = firstNode('./following-sibling::ul[contains(@class, "tabContentList")]', category)
+                    || firstNode('./following-sibling::ul', category);
+                return [category.innerText, list ? Array.from(list.querySelectorAll('li')).map((li) => li.innerText) : null];
+            }),
+            selector: selector
+        };
+    }"""
+    
+    def __init__(self, use_browser_pool=True, pages_per_context=50, concurrency=1,
+                 requests_per_second=0.5, max_in_flight=None, event_waits=True,
+                 wait_timeout=10000, extraction_mode='evaluate', snapshot_dir=None,
+                 cache_dir=None, checkpoint_path=None, delta_from=None, stream_path=None,
+                 start_urls=None, max_scrolls=3, fetch_profile='full', headless=None,
+                 metrics_path=None, max_retries=2, retry_backoff=2.0, retry_max_delay=60.0,
+                 navigation_timeout=30000, dead_letter_path=None, seed_listings=None,
+                 http_fetch=True, selector_state_path=None, min_fill_rate=0.8):
         self.base_url = "https://www.emlakjet.com"
         self.firm_url = "https://www.emlakjet.com/emlak-ofisleri-detay/goktas-emlak-310758"
-        
-    async def create_stealth_context(self, playwright):
-        browser = await playwright.chromium.launch(
-            headless=False,
+        self.seed_listings = list(seed_listings) if seed_listings else []
+        self.start_urls = list(start_urls) if start_urls else ([] if self.seed_listings else [self.firm_url])
+        self.max_scrolls = max_scrolls
+        self.fetch_profile = fetch_profile
+        self.headless = headless if headless is not None else fetch_profile == 'light'
+        self.fetch_stats = {'blocked_requests': 0}
+        self.page_metrics = []
+        self.metrics = EmlakjetMetrics(metrics_path)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.retry_max_delay = retry_max_delay
+        self.navigation_timeout = navigation_timeout
+        self.detail_attempts = {}
+        self.dead_letters = EmlakjetCheckpoint(dead_letter_path) if dead_letter_path else None
+        self.use_browser_pool = use_browser_pool
+        self.pages_per_context = pages_per_context
+        self.browser_pool = None
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = EmlakjetRateLimiter(
+            requests_per_second=requests_per_second,
+            max_in_flight=max_in_flight or self.concurrency
+        )
+        self.worker_stats = []
+        self.event_waits = event_waits
+        self.wait_timeout = wait_timeout
+        self.wait_timings = []
+        self.extraction_mode = extraction_mode
+        self.http_fetch = http_fetch
+        self.next_data = EmlakjetNextDataExtractor()
+        self.selectors = EmlakjetSelectorRegistry(selector_state_path, min_fill_rate=min_fill_rate)
+        self.selectors.register('fiyat', self.PRICE_SELECTORS, exact=len(self.PRICE_EXACT_SELECTORS))
+        self.selectors.register('ilan_bilgileri_key', self.INFO_KEY_SELECTORS)
+        self.selectors.register('ilan_bilgileri_value', self.INFO_VALUE_SELECTORS)
+        self.selectors.register('tab_title', self.TAB_TITLE_SELECTORS)
+        self.degraded_fields = []
+        self.snapshot_dir = snapshot_dir
+        self.page_cache = EmlakjetPageCache(cache_dir) if cache_dir else None
+        self.checkpoint = EmlakjetCheckpoint(checkpoint_path) if checkpoint_path else None
+        self.delta_from = delta_from
+        self.run_diff = None
+        self.stream_path = stream_path
+        self.stream_file = None
+        self.known_listings = {}
+        self.previous_listings = None
+    
+    async def launch_browser(self, playwright):
+        return await playwright.chromium.launch(
+            headless=self.headless,
             args=['--no-sandbox', '--disable-blink-features=AutomationControlled']
         )
-        context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
+    
+    async def new_stealth_context(self, browser):
+        if self.fetch_profile == 'light':
+            context = await browser.new_context(viewport={'width': 1280, 'height': 800})
+            await context.route('**/*', self.route_request)
+        else:
+            context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
         await context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined});")
+        return context
+    
+    def is_first_party(self, url):
+        host = urlparse(url).hostname or ''
+        for start_url in [self.base_url] + self.start_urls:
+            domain = (urlparse(start_url).hostname or '').removeprefix('www.')
+            if domain and (host == domain or host.endswith('.' + domain)):
+                return True
+        return False
+    
+    async def route_request(self, route):
+        """Light profile: abort images, media, fonts, trackers and third-party scripts"""
+        request = route.request
+        host = urlparse(request.url).hostname or ''
+        blocked = (
+            request.resource_type in self.BLOCKED_RESOURCE_TYPES
+            or any(host == t or host.endswith('.' + t) for t in self.TRACKER_HOSTS)
+            or (request.resource_type == 'script' and not self.is_first_party(request.url))
+        )
+        
+        if blocked:
+            self.fetch_stats['blocked_requests'] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def count_response_bytes(self, request, metrics):
+        try:
+            sizes = await request.sizes()
+            metrics['bytes'] += sizes['responseBodySize'] + sizes['responseHeadersSize']
+            metrics['requests'] += 1
+        except Exception:
+            pass
+    
+    async def create_stealth_context(self, playwright):
+        browser = await self.launch_browser(playwright)
+        context = await self.new_stealth_context(browser)
         return browser, context
     
-    async def get_firm_listings(self):
+    async def get_firm_listings(self, url=None):
+        listings, _ = await self.get_listing_page(url or self.firm_url)
+        return listings
+    
+    async def get_listing_page(self, url):
+        """Listings on a firm or search results page plus the pagination links found there"""
+        async with self.rate_limiter.slot(url):
+            return await self.open_listing_page(url)
+    
+    async def open_listing_page(self, url):
+        if self.browser_pool:
+            async with self.browser_pool.page() as page:
+                return await self.fetch_listing_page(page, url)
+        
         async with async_playwright() as playwright:
             browser, context = await self.create_stealth_context(playwright)
             page = await context.new_page()
-            
             try:
-                await page.goto(self.firm_url, wait_until='networkidle')
-                await asyncio.sleep(3)
-                
-                listing_elements = await page.query_selector_all('a[href*="/ilan/"]')
-                listings = []
-                
-                for element in listing_elements:
-                    href = await element.get_attribute('href')
-                    if href and '/ilan/' in href:
-                        full_url = urljoin(self.base_url, href)
-                        listing_id = re.search(r'-(\d+)$', full_url)
-                        if listing_id and full_url not in [l.get('ilanUrl') for l in listings]:
-                            listings.append({
-                                'ilanUrl': full_url,
-                                'ilanNo': listing_id.group(1)
-                            })
-                
-                await browser.close()
-                return listings
-            except:
+                return await self.fetch_listing_page(page, url)
+            finally:
                 await browser.close()
-                return []
+    
+    async def fetch_listing_page(self, page, url):
+        try:
+            await self.goto_and_wait(page, url, [('firm_listings', 'a[href*="/ilan/"]')])
+            await self.scroll_for_more_listings(page)
+            
+            found = await page.evaluate(self.LISTING_LINKS_SCRIPT)
+            listings = []
+            seen = set()
+            
+            for link in found['links']:
+                href = link['href']
+                if href and '/ilan/' in href:
+                    full_url = urljoin(self.base_url, href)
+                    listing_id = re.search(r'-(\d+)$', full_url)
+                    if listing_id and listing_id.group(1) not in seen:
+                        seen.add(listing_id.group(1))
+                        listing = {
+                            'ilanUrl': full_url,
+                            'ilanNo': listing_id.group(1)
+                        }
+                        if self.page_cache or self.delta_from:
+                            match = self.UPDATE_DATE_PATTERN.search(link['card_text'] or '')
+                            listing['ilanGuncellemeTarihi'] = match.group(0) if match else None
+                        listings.append(listing)
+            
+            page_path = urlparse(url).path
+            next_pages = [
+                urljoin(url, href) for href in found['pages']
+                if href and urlparse(urljoin(url, href)).path == page_path
+            ]
+            return listings, next_pages
+        except Exception as e:
+            self.metrics.failure('listing_page', e)
+            return [], []
+    
+    async def scroll_for_more_listings(self, page):
+        """Scroll infinite-scroll result pages until no new listing links appear"""
+        for _ in range(self.max_scrolls):
+            count = await page.evaluate(
+                """() => {
+                    window.scrollTo(0, document.body.scrollHeight);
+                    return document.querySelectorAll('a[href*="/ilan/"]').length;
+                }"""
+            )
+            try:
+                await page.wait_for_function(
+                    "(count) => document.querySelectorAll('a[href*=\"/ilan/\"]').length > count",
+                    arg=count,
+                    timeout=1500
+                )
+            except Exception:
+                return
     
     async def get_listing_details(self, listing_url):
+        async with self.rate_limiter.slot(listing_url):
+            if self.extraction_mode == 'json' and self.http_fetch:
+                return await self.fetch_listing_http_or_browser(listing_url)
+            return await self.open_listing_details(listing_url)
+    
+    def start_listing_metrics(self, listing_url):
+        match = re.search(r'-(\d+)$', listing_url)
+        listing_no = match.group(1) if match else None
+        return self.metrics.start_listing(listing_url, listing_no, self.detail_attempts.get(listing_no, 0))
+    
+    def finish_listing_metrics(self, metrics):
+        self.page_metrics.append(metrics)
+        self.metrics.finish_listing(metrics)
+    
+    async def fetch_listing_http_or_browser(self, listing_url):
+        """HTTP + __NEXT_DATA__ first, the browser when the payload is missing or incomplete; one metrics record"""
+        metrics = self.start_listing_metrics(listing_url)
+        metrics['fetch'] = 'http'
+        details = None
+        try:
+            details = await self.fetch_listing_http(listing_url, metrics)
+            if details and not details.get('eksik_alanlar'):
+                return details
+            
+            metrics['fetch'] = 'http+browser'
+            with self.metrics.phase('browser_fallback'):
+                browser_details = await self.open_listing_details(listing_url, metrics)
+            details = self.more_complete(browser_details, details)
+            return details
+        finally:
+            metrics['status'] = 'ok' if details else 'failed'
+            self.finish_listing_metrics(metrics)
+    
+    def http_get(self, url):
+        request = urllib.request.Request(url, headers={
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                          '(KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Language': 'tr-TR,tr;q=0.9'
+        })
+        with urllib.request.urlopen(request, timeout=self.navigation_timeout / 1000) as response:
+            charset = response.headers.get_content_charset() or 'utf-8'
+            return response.read().decode(charset, errors='replace')
+    
+    async def fetch_listing_http(self, listing_url, metrics):
+        """Plain HTTP GET and the embedded __NEXT_DATA__ payload; None when a browser is needed"""
+        try:
+            with self.metrics.phase('http_fetch'):
+                html = await asyncio.to_thread(self.http_get, listing_url)
+            metrics['bytes'] += len(html.encode('utf-8'))
+            metrics['requests'] += 1
+            if self.snapshot_dir:
+                self.save_snapshot(html, listing_url)
+            
+            with self.metrics.phase('extract_next_data'):
+                details = self.next_data.extract_html(html)
+            if details is None:
+                return None
+            return self.complete_details(details, listing_url, metrics['ilanNo'], html)
+        except Exception as e:
+            self.metrics.failure('http_fetch', e)
+            return None
+    
+    def complete_details(self, details, listing_url, listing_no, html=None, failures=None):
+        """Flag missing sections; a partial record is cached only when `failures` shows the sections are absent"""
+        missing = self.missing_fields(details)
+        if missing:
+            details['eksik_alanlar'] = missing
+        details['ilanUrl'] = listing_url
+        details['ilanNo'] = listing_no
+        
+        # Records from an attempt that hit errors are not cached, so a later run fetches them again
+        if self.page_cache and (not missing or failures is not None and not self.retryable(failures)):
+            self.page_cache.put(listing_no, details, html)
+        return details
+    
+    def retryable(self, failures):
+        """Errors worth another attempt; a LookupError only means the page has no such section"""
+        return any(failure['type'] != 'LookupError' for failure in failures)
+    
+    def observe_fills(self, details):
+        """Count a listing's final record towards the per-field fill rates; None (no record at all) fills nothing"""
+        missing = details.get('eksik_alanlar', []) if details else None
+        for field in ('ilan_bilgileri', 'fiyat_bilgileri', 'ilan_aciklamasi_html', 'ilan_ozellikleri'):
+            self.selectors.observe_fill(field, missing is not None and field not in missing)
+    
+    async def open_listing_details(self, listing_url, metrics=None):
+        if self.browser_pool:
+            async with self.browser_pool.page() as page:
+                return await self.fetch_listing_details(page, listing_url, metrics)
+        
         async with async_playwright() as playwright:
             browser, context = await self.create_stealth_context(playwright)
             page = await context.new_page()
-            
             try:
-                await page.goto(listing_url, wait_until='networkidle')
-                await asyncio.sleep(3)
-                
-                # Extract ALL data from #ilan-hakkinda
-                details = await self.extract_all_ilan_data(page)
-                details['ilanUrl'] = listing_url
-                details['ilanNo'] = re.search(r'-(\d+)$', listing_url).group(1)
-                
-                await browser.close()
-                return details
-            except:
+                return await self.fetch_listing_details(page, listing_url, metrics)
+            finally:
                 await browser.close()
+    
+    async def fetch_listing_details(self, page, listing_url, metrics=None):
+        """Browser fetch; records its own metrics entry unless the caller passes one in"""
+        owns_metrics = metrics is None
+        if owns_metrics:
+            metrics = self.start_listing_metrics(listing_url)
+        listing_no = metrics['ilanNo']
+        pending = []
+        responses = []
+        
+        def on_request_finished(request):
+            pending.append(asyncio.ensure_future(self.count_response_bytes(request, metrics)))
+        
+        def on_response(response):
+            if response.request.resource_type in ('xhr', 'fetch'):
+                responses.append(response)
+        
+        page.on('requestfinished', on_request_finished)
+        if self.extraction_mode == 'json':
+            page.on('response', on_response)
+        
+        try:
+            with self.metrics.phase('navigation'):
+                ready_at = await self.goto_and_wait(page, listing_url, [
+                    ('ilan_hakkinda', '#ilan-hakkinda'),
+                    ('fiyat', ', '.join(self.PRICE_SELECTORS), min(self.wait_timeout, self.OPTIONAL_WAIT_TIMEOUT))
+                ])
+            metrics['time_to_ilan_hakkinda'] = ready_at.get('ilan_hakkinda')
+            
+            html = None
+            if self.snapshot_dir or self.page_cache:
+                with self.metrics.phase('page_content'):
+                    html = await page.content()
+            if self.snapshot_dir:
+                self.save_snapshot(html, listing_url)
+            
+            details = None
+            if self.extraction_mode == 'json':
+                with self.metrics.phase('extract_next_data'):
+                    details = await self.extract_payload_data(page, responses)
+            
+            # Extract ALL data from #ilan-hakkinda, also when the payload left sections empty
+            if details is None or self.missing_fields(details):
+                details = self.more_complete(await self.extract_all_ilan_data(page), details)
+            if details is None:
+                metrics['status'] = 'failed'
                 return None
+            return self.complete_details(details, listing_url, listing_no, html, metrics['failures'])
+        except Exception as e:
+            metrics['status'] = 'failed'
+            self.metrics.failure(metrics.get('failed_phase', 'fetch_listing_details'), e)
+            return None
+        finally:
+            page.remove_listener('requestfinished', on_request_finished)
+            if self.extraction_mode == 'json':
+                page.remove_listener('response', on_response)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            if owns_metrics:
+                self.finish_listing_metrics(metrics)
     
     async def extract_all_ilan_data(self, page):
         """Extract İlan Bilgileri, İlan Açıklaması, İlan Özellikleri, Fiyat"""
+        result = None
         try:
             # Check if container exists
             container = await page.query_selector('#ilan-hakkinda')
             if not container:
+                self.metrics.failure('extract_all_ilan_data', LookupError('#ilan-hakkinda bulunamadı'))
                 return None
             
             result = {
@@ -87,71 +470,94 @@ class EmlakjetStrictScraper:
             }
             
             # 1) İlan Bilgileri
-            await self.extract_ilan_bilgileri(container, result['ilan_bilgileri'])
+            with self.metrics.phase('extract_ilan_bilgileri'):
+                await self.extract_ilan_bilgileri(container, result['ilan_bilgileri'])
             
             # 2) Fiyat Bilgileri
-            await self.extract_fiyat_bilgileri(page, result['fiyat_bilgileri'])
+            with self.metrics.phase('extract_fiyat_bilgileri'):
+                await self.extract_fiyat_bilgileri(page, result['fiyat_bilgileri'])
             
             # 3) İlan Açıklaması
-            await self.extract_ilan_aciklamasi(container, result)
+            with self.metrics.phase('extract_ilan_aciklamasi'):
+                await self.extract_ilan_aciklamasi(container, result)
             
             # 4) İlan Özellikleri
-            await self.extract_ilan_ozellikleri(page, result['ilan_ozellikleri'])
-            
-            return result
+            with self.metrics.phase('extract_ilan_ozellikleri'):
+                await self.extract_ilan_ozellikleri(page, result['ilan_ozellikleri'])
         except Exception as e:
             print(f"Extraction error: {e}")
-            return None
+            self.metrics.failure('extract_all_ilan_data', e)
+            if result is None:
+                return None
+        
+        # Keep whatever was extracted; complete_details lists the sections that are missing
+        return result
+    
+    async def extract_payload_data(self, page, responses):
+        """Map the page's __NEXT_DATA__ or a captured XHR JSON response, skipping tab clicks"""
+        payload_text = await page.evaluate(
+            "() => { const s = document.getElementById('__NEXT_DATA__'); return s ? s.textContent : null; }"
+        )
+        if payload_text:
+            try:
+                details = self.next_data.extract(json.loads(payload_text))
+            except ValueError:
+                details = None
+            if details:
+                return details
+        
+        for response in responses:
+            try:
+                payload = await response.json()
+            except Exception:
+                continue
+            details = self.next_data.extract(payload)
+            if details:
+                return details
+        return None
+    
+    def more_complete(self, details, other):
+        """Whichever record has fewer missing sections; `details` on ties"""
+        if details is None or other is None:
+            return other if details is None else details
+        return other if len(self.missing_fields(other)) < len(self.missing_fields(details)) else details
+    
+    def missing_fields(self, result):
+        checks = {
+            'ilan_bilgileri': bool(result['ilan_bilgileri']),
+            'fiyat_bilgileri': result['fiyat_bilgileri'].get('fiyat') is not None,
+            'ilan_aciklamasi_html': result['ilan_aciklamasi_html'] is not None,
+            'ilan_ozellikleri': any(result['ilan_ozellikleri'].values())
+        }
+        return [field for field, complete in checks.items() if not complete]
     
     async def extract_fiyat_bilgileri(self, page, fiyat_bilgileri):
         """Extract price information"""
         try:
-            # Try multiple price selectors
-            price_selectors = [
-                'span.n-prop-detail-price',
-                'div.price',
-                'span.price',
-                'div.fiyat',
-                'span.fiyat',
-                'div[class*="price"]',
-                'span[class*="price"]',
-                'div[class*="fiyat"]',
-                'span[class*="fiyat"]'
-            ]
-            
-            for selector in price_selectors:
-                price_elem = await page.query_selector(selector)
-                if price_elem:
-                    price_text = await price_elem.inner_text()
-                    if price_text and price_text.strip():
-                        fiyat_bilgileri['fiyat_text'] = price_text.strip()
-                        
-                        # Extract numeric value
-                        import re
-                        price_match = re.search(r'[\d.]+', price_text.replace('.', ''))
-                        if price_match:
-                            fiyat_bilgileri['fiyat'] = int(price_match.group().replace('.', ''))
-                        
-                        # Extract currency
-                        if 'TL' in price_text or '₺' in price_text:
-                            fiyat_bilgileri['para_birimi'] = 'TL'
-                        elif '$' in price_text:
-                            fiyat_bilgileri['para_birimi'] = 'USD'
-                        elif '€' in price_text:
-                            fiyat_bilgileri['para_birimi'] = 'EUR'
-                        
-                        return
+            selectors = self.selectors.ordered('fiyat')
+            if self.extraction_mode != 'dom':
+                found = await page.evaluate(self.FIYAT_SCRIPT, selectors)
+                self.selectors.record('fiyat', selectors, found['selector'])
+                if found['price_text']:
+                    self.parse_price_text(found['price_text'], fiyat_bilgileri)
+                    return
+                title = found['title']
+            else:
+                # Try price selectors, last winner first
+                for selector in selectors:
+                    price_elem = await page.query_selector(selector)
+                    if price_elem:
+                        price_text = await price_elem.inner_text()
+                        if price_text and price_text.strip():
+                            self.selectors.record('fiyat', selectors, selector)
+                            self.parse_price_text(price_text, fiyat_bilgileri)
+                            return
+                
+                self.selectors.record('fiyat', selectors, None)
+                title = await page.title()
             
             # Try to find price in page title or meta tags
-            title = await page.title()
-            if title:
-                import re
-                price_match = re.search(r'([\d.]+)\s*(?:TL|₺|\$|€)', title)
-                if price_match:
-                    fiyat_bilgileri['fiyat_text'] = price_match.group(0)
-                    fiyat_bilgileri['fiyat'] = int(price_match.group(1).replace('.', ''))
-                    if 'TL' in price_match.group(0) or '₺' in price_match.group(0):
-                        fiyat_bilgileri['para_birimi'] = 'TL'
+            self.parse_price_title(title, fiyat_bilgileri)
             
             # If still no price, check if it's mentioned in description
             if not fiyat_bilgileri.get('fiyat'):
@@ -160,17 +566,46 @@ class EmlakjetStrictScraper:
                 
         except Exception as e:
             print(f"Fiyat extraction error: {e}")
+            self.metrics.failure('extract_fiyat_bilgileri', e)
             fiyat_bilgileri['fiyat'] = None
             fiyat_bilgileri['not'] = f'Extraction error: {e}'
     
+    def save_snapshot(self, html, listing_url):
+        """Store the rendered HTML so it can be re-parsed offline by EmlakjetHtmlParser"""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        listing_no = re.search(r'-(\d+)$', listing_url).group(1)
+        
+        with open(os.path.join(self.snapshot_dir, f'{listing_no}.html'), 'w', encoding='utf-8') as f:
+            f.write(f'<!-- {listing_url} -->\n')
+            f.write(html)
+    
     async def extract_ilan_bilgileri(self, container, bilgiler):
         """Extract key-value pairs from İlan Bilgileri"""
+        key_selectors = self.selectors.ordered('ilan_bilgileri_key')
+        value_selectors = self.selectors.ordered('ilan_bilgileri_value')
+        if self.extraction_mode != 'dom':
+            try:
+                found = await container.evaluate(self.ILAN_BILGILERI_SCRIPT, [key_selectors, value_selectors])
+                self.selectors.record('ilan_bilgileri_key', key_selectors, found['key_selector'])
+                self.selectors.record('ilan_bilgileri_value', value_selectors, found['value_selector'])
+                for key_text, value_text in found['pairs']:
+                    field_name = self.map_key_to_field(key_text.strip())
+                    if field_name:
+                        bilgiler[field_name] = value_text.strip()
+            except Exception as e:
+                self.metrics.failure('extract_ilan_bilgileri', e)
+            return
+        
         try:
             list_items = await container.query_selector_all('ul > li')
+            key_selector = await self.first_matching_selector(list_items, 'ilan_bilgileri_key', key_selectors)
+            value_selector = await self.first_matching_selector(list_items, 'ilan_bilgileri_value', value_selectors)
+            if not key_selector or not value_selector:
+                return
             
             for item in list_items:
-                key_span = await item.query_selector('span.styles_key__wX_g4')
-                value_span = await item.query_selector('span.styles_value__xmNV3')
+                key_span = await item.query_selector(key_selector)
+                value_span = await item.query_selector(value_selector)
                 
                 if key_span and value_span:
                     key_text = await key_span.inner_text()
@@ -179,18 +614,35 @@ class EmlakjetStrictScraper:
                     field_name = self.map_key_to_field(key_text.strip())
                     if field_name:
                         bilgiler[field_name] = value_text.strip()
-        except:
-            pass
+        except Exception as e:
+            self.metrics.failure('extract_ilan_bilgileri', e)
+    
+    async def first_matching_selector(self, elements, group, selectors):
+        """First selector in registry order that matches inside any of `elements` (DOM mode)"""
+        for selector in selectors:
+            for element in elements:
+                if await element.query_selector(selector):
+                    self.selectors.record(group, selectors, selector)
+                    return selector
+        
+        self.selectors.record(group, selectors, None)
+        return None
     
     async def extract_ilan_aciklamasi(self, container, result):
         """Extract İlan Açıklaması HTML"""
         try:
+            if self.extraction_mode != 'dom':
+                aciklama_html = await container.evaluate(self.ILAN_ACIKLAMASI_SCRIPT)
+                if aciklama_html is not None:
+                    result['ilan_aciklamasi_html'] = aciklama_html
+                return
+            
             # Find the section with "İlan Açıklaması" heading
             aciklama_section = await container.query_selector('xpath=.//h2[contains(text(), "İlan Açıklaması")]/following-sibling::div//div[contains(@class, "styles_inner")]')
             if aciklama_section:
                 result['ilan_aciklamasi_html'] = await aciklama_section.inner_html()
-        except:
-            pass
+        except Exception as e:
+            self.metrics.failure('extract_ilan_aciklamasi', e)
     
     async def extract_ilan_ozellikleri(self, page, ozellikler):
         """Extract İlan Özellikleri (İç/Dış/Konum)"""
@@ -202,6 +654,7 @@ class EmlakjetStrictScraper:
                 ozellikler_section = await page.query_selector('xpath=.//h2[contains(text(), "İlan Özellikleri")]')
             if not ozellikler_section:
                 print("İlan Özellikleri section bulunamadı")
+                self.metrics.failure('extract_ilan_ozellikleri', LookupError('İlan Özellikleri section bulunamadı'))
                 return
             
             # Get the parent section
@@ -210,19 +663,27 @@ class EmlakjetStrictScraper:
                 return
             
             # Extract İç Özellikler (default selected)
-            await self.extract_tab_ozellikleri(parent_section, 'ic_ozellikler', ozellikler['ic_ozellikler'])
+            with self.metrics.phase('tab_ic_ozellikler'):
+                await self.extract_tab_ozellikleri(parent_section, 'ic_ozellikler', ozellikler['ic_ozellikler'])
             
             # Extract Dış Özellikler
-            await self.click_and_extract_tab(parent_section, 'Dış Özellikler', 'dis_ozellikler', ozellikler['dis_ozellikler'])
+            with self.metrics.phase('tab_dis_ozellikler'):
+                await self.click_and_extract_tab(parent_section, 'Dış Özellikler', 'dis_ozellikler', ozellikler['dis_ozellikler'])
             
             # Extract Konum Özellikleri
-            await self.click_and_extract_tab(parent_section, 'Konum Özellikleri', 'konum_ozellikleri', ozellikler['konum_ozellikleri'])
+            with self.metrics.phase('tab_konum_ozellikleri'):
+                await self.click_and_extract_tab(parent_section, 'Konum Özellikleri', 'konum_ozellikleri', ozellikler['konum_ozellikleri'])
             
         except Exception as e:
             print(f"Özellikler extraction error: {e}")
+            self.metrics.failure('extract_ilan_ozellikleri', e)
     
     async def extract_tab_ozellikleri(self, section, tab_name, target_dict):
         """Extract features from currently active tab"""
+        if self.extraction_mode != 'dom':
+            await self.evaluate_tab_ozellikleri(section, tab_name, target_dict)
+            return
+        
         try:
             # Find active tab content
             active_tab = await section.query_selector('div[role="tabpanel"][data-headlessui-state="selected"]')
@@ -231,10 +692,13 @@ class EmlakjetStrictScraper:
                 active_tab = await section.query_selector('div[role="tabpanel"]')
             if not active_tab:
                 print(f"Active tab bulunamadı: {tab_name}")
+                self.metrics.failure(f'tab_{tab_name}', LookupError(f'Active tab bulunamadı: {tab_name}'))
                 return
             
             # Extract categories and features
-            categories = await active_tab.query_selector_all('div.styles_tabContentTitle__3Q2jN')
+            selectors = self.selectors.ordered('tab_title')
+            selector = await self.first_matching_selector([active_tab], 'tab_title', selectors)
+            categories = await active_tab.query_selector_all(selector) if selector else []
             
             for category in categories:
                 category_name = await category.inner_text()
@@ -257,6 +721,26 @@ class EmlakjetStrictScraper:
                         target_dict[category_name] = features
         except Exception as e:
             print(f"Tab extraction error ({tab_name}): {e}")
+            self.metrics.failure(f'tab_{tab_name}', e)
+    
+    async def evaluate_tab_ozellikleri(self, section, tab_name, target_dict):
+        """Extract the active tab's categories and features in a single page.evaluate"""
+        try:
+            selectors = self.selectors.ordered('tab_title')
+            found = await section.evaluate(self.TAB_OZELLIKLERI_SCRIPT, selectors)
+            if found is None:
+                print(f"Active tab bulunamadı: {tab_name}")
+                self.metrics.failure(f'tab_{tab_name}', LookupError(f'Active tab bulunamadı: {tab_name}'))
+                return
+            
+            self.selectors.record('tab_title', selectors, found['selector'])
+            for category_name, feature_texts in found['categories']:
+                features = [text.strip() for text in feature_texts or []]
+                if features:
+                    target_dict[category_name.strip()] = features
+        except Exception as e:
+            print(f"Tab extraction error ({tab_name}): {e}")
+            self.metrics.failure(f'tab_{tab_name}', e)
     
     async def click_and_extract_tab(self, section, tab_text, tab_key, target_dict):
         """Click a tab and extract its features"""
@@ -267,69 +751,407 @@ class EmlakjetStrictScraper:
                 # Try alternative selector
                 tab_button = await section.query_selector(f'xpath=.//button[contains(text(), "{tab_text}")]')
             if tab_button:
-                await tab_button.click()
-                await asyncio.sleep(2)  # Wait for content to load
+                if self.event_waits:
+                    previous_text = await self.active_tab_text(section)
+                    await tab_button.click()
+                    await self.wait_for_tab_change(section, tab_key, previous_text)
+                else:
+                    await tab_button.click()
+                    await asyncio.sleep(2)  # Wait for content to load
                 
                 # Extract from newly activated tab
                 await self.extract_tab_ozellikleri(section, tab_key, target_dict)
             else:
                 print(f"Tab button bulunamadı: {tab_text}")
+                self.metrics.failure(f'tab_{tab_key}', LookupError(f'Tab button bulunamadı: {tab_text}'))
         except Exception as e:
             print(f"Tab click error ({tab_text}): {e}")
+            self.metrics.failure(f'tab_{tab_key}', e)
+    
+    async def goto_and_wait(self, page, url, conditions):
+        """Navigate and wait for concrete selectors instead of networkidle + fixed sleep.
+        
+        Conditions are (name, selector) or (name, selector, timeout_ms); waiting stops at the
+        first one that times out. Returns the seconds from navigation start until each fired condition.
+        """
+        started = time.perf_counter()
+        ready_at = {}
+        if not self.event_waits:
+            await page.goto(url, wait_until='networkidle', timeout=self.navigation_timeout)
+            await asyncio.sleep(3)
+            return ready_at
+        
+        await page.goto(url, wait_until='domcontentloaded', timeout=self.navigation_timeout)
+        for condition, selector, *timeout in conditions:
+            fired = await self.wait_for_condition(
+                condition,
+                page.wait_for_selector(selector, state='attached', timeout=timeout[0] if timeout else self.wait_timeout)
+            )
+            if not fired:
+                return ready_at
+            ready_at[condition] = round(time.perf_counter() - started, 3)
+        return ready_at
+    
+    async def wait_for_condition(self, condition, waiter):
+        """Await a readiness condition and record how long it actually took"""
+        started = time.perf_counter()
+        try:
+            await waiter
+            fired = True
+        except Exception:
+            fired = False
+        
+        self.wait_timings.append({
+            'condition': condition,
+            'seconds': round(time.perf_counter() - started, 3),
+            'fired': fired
+        })
+        return fired
+    
+    async def active_tab_text(self, section):
+        return await section.evaluate(
+            """(section) => {
+                const panel = section.querySelector('div[role="tabpanel"][data-headlessui-state="selected"]')
+                    || section.querySelector('div[role="tabpanel"]');
+                return panel ? panel.innerText : null;
+            }"""
+        )
+    
+    async def wait_for_tab_change(self, section, tab_key, previous_text):
+        frame = await section.owner_frame()
+        fired = await self.wait_for_condition(
+            f'tab_{tab_key}',
+            frame.wait_for_function(
+                """([section, previous]) => {
+                    const panel = section.querySelector('div[role="tabpanel"][data-headlessui-state="selected"]')
+                        || section.querySelector('div[role="tabpanel"]');
+                    return panel !== null && panel.innerText !== previous;
+                }""",
+                arg=[section, previous_text],
+                timeout=min(self.wait_timeout, self.TAB_WAIT_TIMEOUT)
+            )
+        )
+        return fired
     
-    def map_key_to_field(self, key_text):
-        mapping = {
-            'İlan Numarası': 'ilan_numarasi',
-            'İlan Güncelleme Tarihi': 'ilan_guncelleme_tarihi',
-            'Türü': 'turu',
-            'Kategorisi': 'kategorisi',
-            'Tipi': 'tipi',
-            'Net Metrekare': 'net_metrekare',
-            'Brüt Metrekare': 'brut_metrekare',
-            'Oda Sayısı': 'oda_sayisi',
-            'Binanın Yaşı': 'bina_yasi',
-            'Bulunduğu Kat': 'bulundugu_kat',
-            'Binanın Kat Sayısı': 'toplam_kat_sayisi',
-            'Isıtma Tipi': 'isitma_tipi',
-            'Kullanım Durumu': 'kullanim_durumu',
-            'Krediye Uygunluk': 'krediye_uygunluk',
-            'Tapu Durumu': 'tapu_durumu',
-            'Site İçerisinde': 'site_icerisinde',
-            'Banyo Sayısı': 'banyo_sayisi',
-            'Fiyat Durumu': 'fiyat_durumu'
+    def wait_summary(self):
+        """Total time spent per readiness condition and how often it timed out"""
+        summary = {}
+        for timing in self.wait_timings:
+            entry = summary.setdefault(timing['condition'], {'count': 0, 'seconds': 0.0, 'fallbacks': 0})
+            entry['count'] += 1
+            entry['seconds'] = round(entry['seconds'] + timing['seconds'], 3)
+            if not timing['fired']:
+                entry['fallbacks'] += 1
+        return summary
+    
+    def fetch_summary(self):
+        """Bytes transferred and time to #ilan-hakkinda per detail page"""
+        timed = sorted(m['time_to_ilan_hakkinda'] for m in self.page_metrics if m['time_to_ilan_hakkinda'] is not None)
+        total_bytes = sum(m['bytes'] for m in self.page_metrics)
+        return {
+            'profile': self.fetch_profile,
+            'pages': len(self.page_metrics),
+            'avg_bytes': round(total_bytes / len(self.page_metrics)) if self.page_metrics else 0,
+            'total_bytes': total_bytes,
+            'blocked_requests': self.fetch_stats['blocked_requests'],
+            'p50_time_to_ilan_hakkinda': timed[len(timed) // 2] if timed else None
         }
-        return mapping.get(key_text)
     
     async def scrape_all_listings(self):
         print("Emlakjet Strict scraping başlatılıyor...")
+        self.metrics.open()
         
-        listings = await self.get_firm_listings()
+        if self.use_browser_pool:
+            self.browser_pool = EmlakjetBrowserPool(self, pages_per_context=self.pages_per_context)
+            await self.browser_pool.start()
         
-        if not listings:
-            print("Hiç ilan bulunamadı!")
-            return []
+        try:
+            previous = self.load_previous_run()
+            self.known_listings = self.checkpoint.load() if self.checkpoint else {}
+            self.previous_listings = previous
+            
+            if self.stream_path:
+                self.stream_file = open(self.stream_path, 'w', encoding='utf-8')
+            
+            frontier = EmlakjetCrawlFrontier()
+            for i, url in enumerate(self.start_urls):
+                frontier.add_page(url, (i, self.page_number(url, 1)))
+            for i, listing in enumerate(self.seed_listings):
+                if frontier.add_listing(listing, (-1, 0, i)):
+                    frontier.add_detail(listing)
+            
+            resolved = await self.crawl(frontier)
+            listings = frontier.ordered_listings()
+            
+            if not listings:
+                print("Hiç ilan bulunamadı!")
+                return []
+            
+            print(f"Toplam {len(listings)} ilan, {len(frontier.seen_pages)} liste sayfası işlendi")
+            if self.page_cache:
+                self.page_cache.evict()
+            
+            detailed_listings = [resolved[l['ilanNo']] for l in listings if l['ilanNo'] in resolved]
+            if previous is not None:
+                self.run_diff = self.diff_listings(previous, detailed_listings, listings)
+            
+            self.degraded_fields = self.selectors.degraded_fields()
+            if self.degraded_fields:
+                print(f"UYARI: doluluk oranı %{self.selectors.min_fill_rate * 100:.0f} altında: "
+                      f"{', '.join(self.degraded_fields)} (seçiciler değişmiş olabilir)")
+            return detailed_listings
+        finally:
+            self.metrics.close()
+            self.selectors.save()
+            if self.stream_file:
+                self.stream_file.close()
+                self.stream_file = None
+            if self.browser_pool:
+                await self.browser_pool.close()
+                self.browser_pool = None
+    
+    def load_previous_run(self):
+        """Previous run's records keyed by ilanNo, or None when not in delta mode"""
+        if not self.delta_from:
+            return None
         
-        print(f"Toplam {len(listings)} ilan detayları alınıyor...")
+        try:
+            return {
+                record['ilanNo']: record
+                for record in EmlakjetDatabaseNormalizer().iter_raw_listings(self.delta_from)
+                if record.get('ilanNo')
+            }
+        except (OSError, ValueError) as e:
+            print(f"Önceki çalışma okunamadı ({self.delta_from}): {e}")
+            return {}
+    
+    def resolve_known_listing(self, listing):
+        """Record that needs no fetch: journaled by an interrupted run, or unchanged since the previous run"""
+        listing_no = listing['ilanNo']
+        if listing_no in self.known_listings:
+            return self.known_listings[listing_no]
         
-        detailed_listings = []
-        for i, listing in enumerate(listings):
-            print(f"[{i+1}/{len(listings)}] İlan: {listing['ilanNo']}")
-            details = await self.get_listing_details(listing['ilanUrl'])
-            if details:
-                detailed_listings.append(details)
+        previous = self.previous_listings
+        if not previous or listing_no not in previous:
+            return None
+        
+        update_date = listing.get('ilanGuncellemeTarihi')
+        previous_date = previous[listing_no].get('ilan_bilgileri', {}).get('ilan_guncelleme_tarihi')
+        if not update_date or update_date == previous_date:
+            return previous[listing_no]
+        return None
+    
+    def stream_record(self, details):
+        """Write one record as a JSON line as soon as it is available"""
+        self.stream_file.write(json.dumps(details, ensure_ascii=False) + '\n')
+        self.stream_file.flush()
+    
+    def diff_listings(self, previous, detailed_listings, listings):
+        current_numbers = {listing['ilanNo'] for listing in listings}
+        return {
+            'added': [r['ilanNo'] for r in detailed_listings if r['ilanNo'] not in previous],
+            'removed': [listing_no for listing_no in previous if listing_no not in current_numbers],
+            'changed': [
+                r['ilanNo'] for r in detailed_listings
+                if r['ilanNo'] in previous and previous[r['ilanNo']] != r
+            ]
+        }
+    
+    async def crawl(self, frontier):
+        """Run listing-page and detail tasks from one frontier queue with a pool of workers"""
+        resolved = {}
+        self.worker_stats = [
+            {'worker': worker_id, 'pages': 0, 'listings': 0, 'busy_seconds': 0.0, 'timings': []}
+            for worker_id in range(self.concurrency)
+        ]
+        
+        workers = [
+            asyncio.create_task(self.crawl_worker(frontier, resolved, stats))
+            for stats in self.worker_stats
+        ]
+        await frontier.join()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        
+        return resolved
+    
+    async def crawl_worker(self, frontier, resolved, stats):
+        while True:
+            task = await frontier.queue.get()
+            try:
+                if task[0] == 'page':
+                    await self.process_listing_page(frontier, resolved, task[1], stats)
+                else:
+                    await self.process_listing(frontier, resolved, task[1], stats)
+            except Exception as e:
+                print(f"Worker error ({task[1]}): {e}")
+                self.metrics.failure('worker', e)
+            finally:
+                frontier.queue.task_done()
+    
+    async def process_listing_page(self, frontier, resolved, url, stats):
+        print(f"Liste sayfası: {url}")
+        started = time.perf_counter()
+        listings, next_pages = await self.get_listing_page(url)
+        stats['pages'] += 1
+        stats['busy_seconds'] += time.perf_counter() - started
+        
+        start_index, page_number = frontier.page_order[url]
+        for position, listing in enumerate(listings):
+            if not frontier.add_listing(listing, (start_index, page_number, position)):
+                continue
+            
+            known = self.resolve_known_listing(listing)
+            if known:
+                resolved[listing['ilanNo']] = known
+                if self.stream_file:
+                    self.stream_record(known)
+            else:
+                frontier.add_detail(listing)
+        
+        for next_page in next_pages:
+            frontier.add_page(next_page, (start_index, self.page_number(next_page, page_number + 1)))
+    
+    def page_number(self, url, default):
+        """Page number from a sayfa=/page= query parameter, else `default` (one past the linking page)"""
+        match = self.PAGE_NUMBER_PATTERN.search(url)
+        return int(match.group(1)) if match else default
+    
+    async def process_listing(self, frontier, resolved, listing, stats):
+        print(f"[{len(resolved)+1}/{len(frontier.listings)}] İlan: {listing['ilanNo']}")
+        details = None
+        failed = False
+        if self.page_cache:
+            details = self.page_cache.get(listing['ilanNo'], listing.get('ilanGuncellemeTarihi'))
+        
+        if not details:
+            started = time.perf_counter()
+            failures_before = len(self.metrics.failures)
+            try:
+                details = await self.get_listing_details(listing['ilanUrl'])
+            except Exception as e:
+                # Browser launch, page acquisition or a crashed browser: retried like any other failed fetch
+                print(f"İlan hatası ({listing['ilanNo']}): {e}")
+                self.metrics.failure('get_listing_details', e, listing)
+                details = None
+            elapsed = time.perf_counter() - started
+            
+            stats['listings'] += 1
+            stats['busy_seconds'] += elapsed
+            stats['timings'].append({'ilanNo': listing['ilanNo'], 'seconds': round(elapsed, 3)})
             
-            await asyncio.sleep(2)
+            # Only an attempt that hit errors is retried; sections the page lacks stay flagged in eksik_alanlar
+            failed = not details or self.retryable(
+                failure for failure in self.metrics.failures[failures_before:]
+                if failure.get('ilanNo') == listing['ilanNo']
+            )
+            if failed and self.retry_or_dead_letter(frontier, listing):
+                return
+            # A listing dead-lettered without any record counts as unfilled, so a run of failed fetches is degraded
+            self.observe_fills(details)
+            if not details:
+                return
         
-        return detailed_listings
+        resolved[listing['ilanNo']] = details
+        if self.checkpoint and not failed:
+            self.checkpoint.record(details)
+        if self.stream_file:
+            self.stream_record(details)
+    
+    def retry_delay(self, attempt):
+        """Exponential backoff with equal jitter: half the delay fixed, half random"""
+        delay = min(self.retry_max_delay, self.retry_backoff * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+    
+    def retry_or_dead_letter(self, frontier, listing):
+        """Requeue a failed listing with backoff (returns True), or journal it once retries are used up"""
+        listing_no = listing['ilanNo']
+        attempt = self.detail_attempts.get(listing_no, 0) + 1
+        self.detail_attempts[listing_no] = attempt
+        
+        if attempt <= self.max_retries:
+            delay = self.retry_delay(attempt)
+            self.metrics.retry(listing_no, attempt, delay)
+            print(f"Tekrar denenecek ({attempt}/{self.max_retries}, {delay:.1f} sn): {listing_no}")
+            frontier.add_retry(listing, delay)
+            return True
+        
+        print(f"Başarısız, dead-letter listesine eklendi: {listing_no}")
+        if self.dead_letters:
+            failures = [f for f in self.metrics.failures if f.get('ilanNo') == listing_no]
+            self.dead_letters.record(dict(listing, attempts=attempt, failures=failures[-5:]))
+        return False
 
 async def main():
-    scraper = EmlakjetStrictScraper()
+    dead_letters = EmlakjetCheckpoint('emlakjet_dead_letter.jsonl')
+    seed_listings = None
+    rerun = 'dead-letter' in sys.argv[1:]
+    if rerun:
+        # Re-run only the listings that failed every attempt last time
+        seed_listings = [
+            {'ilanUrl': record['ilanUrl'], 'ilanNo': record['ilanNo']}
+            for record in dead_letters.load().values()
+        ]
+        if not seed_listings:
+            print("Dead-letter listesi boş")
+            return
+    
+    # A rerun journals its failures and progress separately; the old list is replaced only once it finishes
+    new_dead_letters = EmlakjetCheckpoint('emlakjet_dead_letter_next.jsonl') if rerun else dead_letters
+    new_dead_letters.clear()
+    
+    # A rerun writes its own output file in either format, never over the full run's output
+    stream = 'ndjson' in sys.argv[1:]
+    extension = '.jsonl' if stream else '.json'
+    output_file = ('emlakjet_listings_dead_letter_raw' if rerun else 'emlakjet_listings_raw') + extension
+    scraper = EmlakjetStrictScraper(
+        cache_dir='cache',
+        checkpoint_path='emlakjet_dead_letter_checkpoint.jsonl' if rerun else 'emlakjet_checkpoint.jsonl',
+        delta_from='emlakjet_listings_raw' + extension if 'delta' in sys.argv[1:] else None,
+        stream_path=output_file + '.partial' if stream else None,
+        start_urls=[arg for arg in sys.argv[1:] if arg.startswith('http')],
+        fetch_profile='light' if 'light' in sys.argv[1:] else 'full',
+        extraction_mode='json' if 'json' in sys.argv[1:] else 'evaluate',
+        metrics_path='emlakjet_metrics.jsonl',
+        dead_letter_path=new_dead_letters.journal_path,
+        seed_listings=seed_listings,
+        selector_state_path='emlakjet_selectors.json'
+    )
     listings = await scraper.scrape_all_listings()
     
-    with open('emlakjet_listings_raw.json', 'w', encoding='utf-8') as f:
-        json.dump(listings, f, ensure_ascii=False, indent=2)
+    if scraper.degraded_fields:
+        # Keep the last good output (and the delta baseline) instead of overwriting it with empty fields
+        root, ext = os.path.splitext(output_file)
+        output_file = root + '.degraded' + ext
+    if scraper.stream_path:
+        # Streamed records get their final name only once the run has finished
+        os.replace(scraper.stream_path, output_file)
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(listings, f, ensure_ascii=False, indent=2)
+    if not scraper.degraded_fields:
+        # A degraded run keeps its checkpoint; the rerun after a selector fix resumes from the complete records
+        scraper.checkpoint.clear()
+    if rerun:
+        if os.path.exists(new_dead_letters.journal_path):
+            os.replace(new_dead_letters.journal_path, dead_letters.journal_path)
+        else:
+            dead_letters.clear()
     
     print(f"Toplam {len(listings)} ilan başarıyla çekildi ve kaydedildi.")
+    print(f"Bekleme süreleri: {json.dumps(scraper.wait_summary(), ensure_ascii=False)}")
+    print(f"Sayfa yükü: {json.dumps(scraper.fetch_summary(), ensure_ascii=False)}")
+    print(f"Metrikler: {json.dumps(scraper.metrics.summary(), ensure_ascii=False)}")
+    if scraper.page_cache:
+        print(f"Önbellek: {json.dumps(scraper.page_cache.summary(), ensure_ascii=False)}")
+    if scraper.run_diff is not None:
+        print(f"Değişiklikler: eklenen {len(scraper.run_diff['added'])}, "
+              f"kaldırılan {len(scraper.run_diff['removed'])}, değişen {len(scraper.run_diff['changed'])}")
+    print(f"Seçiciler: {json.dumps(scraper.selectors.summary(), ensure_ascii=False)}")
+    if scraper.degraded_fields:
+        print(f"Çalışma eksik veriyle tamamlandı, çıktı {output_file} dosyasına yazıldı")
+        sys.exit(1)
 
 if __name__ == "__main__":
     asyncio.run(main())